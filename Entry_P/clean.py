@@ -17,6 +17,8 @@ import json
 import sys
 from pathlib import Path
 
+from reporter import READABLE_SCHEMA_VERSIONS
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -48,8 +50,22 @@ def main():
     with open(report_path, "r") as f:
         data = json.load(f)
 
+    schema = data.get("schema_version")
+    if schema not in READABLE_SCHEMA_VERSIONS:
+        print(f"Error: Report schema {schema} is not supported "
+              f"(expected {', '.join(READABLE_SCHEMA_VERSIONS)}).")
+        print(f"Run 'python3 scan.py {repo_root}' to regenerate the scan artifact.")
+        return 1
+
     # Extract data structures from the JSON artifact
-    file_data = data.get("layer_1_evidence", {}).get("files", [])
+    evidence = data.get("layer_1_evidence", {})
+    file_data = evidence.get("files", [])
+    if not file_data and evidence.get("files_ref"):
+        # Evidence records live in an NDJSON sidecar next to the report
+        files_path = report_path.parent / evidence["files_ref"]
+        if files_path.exists():
+            with open(files_path, "r", encoding="utf-8") as f:
+                file_data = [json.loads(line) for line in f if line.strip()]
     if not file_data:
         print("Error: No file data in report. Re-run scan.py to regenerate.")
         return 1
@@ -0,0 +1,24 @@
+"""
+Engine Fingerprint
+Identifies the exact engine build, so on-disk caches (scan, policy, risk)
+written by a different version of these sources are never reused.
+"""
+import hashlib
+from pathlib import Path
+
+_engine_digest = None
+
+
+def engine_fingerprint() -> str:
+    """Hash of the engine's own .py sources (computed once per process)."""
+    global _engine_digest
+    if _engine_digest is None:
+        h = hashlib.sha256()
+        for p in sorted(Path(__file__).resolve().parent.glob("*.py")):
+            h.update(p.name.encode())
+            try:
+                h.update(p.read_bytes())
+            except OSError:
+                continue
+        _engine_digest = h.hexdigest()
+    return _engine_digest
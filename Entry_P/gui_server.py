@@ -184,6 +184,7 @@ class GUIHandler(http.server.BaseHTTPRequestHandler):
         content_types = {
             ".html": "text/html",
             ".json": "application/json",
+            ".ndjson": "application/x-ndjson",
             ".js": "application/javascript",
             ".css": "text/css",
         }
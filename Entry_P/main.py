@@ -11,13 +11,16 @@ This separation ensures users can safely run scans on production codebases
 without any file-modification machinery being loaded into memory.
 """
 import argparse
+import logging
 import os
+import pickle
+import sys
 from pathlib import Path
 from entrypoint_detector import EntrypointDetector
 from static_analyzer import StaticAnalyzer
 from runtime_tracer import RuntimeTracer
 from text_scanner import TextScanner
-from reporter import Reporter
+from reporter import Reporter, UTC_TIMESTAMP_FORMAT
 from graph_engine import GraphEngine
 from risk_analyzer import RiskAnalyzer
 from simulation_engine import SimulationEngine
@@ -26,6 +29,7 @@ from cartography import CartographyEngine
 from triangulator import Triangulator
 from entry_tagger import EntryTagger
 from policy_enforcer import PolicyEnforcer
+from engine_version import engine_fingerprint
 # NOTE: PruningEngine and QuarantineEngine are lazy-imported ONLY when
 # --prune or --quarantine flags are passed. They are never loaded during
 # read-only scans. This is intentional -- see "Diagnosis vs Surgery" separation.
@@ -37,6 +41,96 @@ import uuid
 import hashlib
 from datetime import datetime
 
+log = logging.getLogger("rie")
+
+# Whole-scan results cache (keyed by a manifest of file stats + config), the
+# PolicyEnforcer cache (keyed by its inputs) and the per-file static import
+# and risk-pattern caches (keyed by file stats).
+# All live under reports/ so discovery never picks them up.
+SCAN_CACHE_DIR = Path("reports") / ".rie_cache" / "scan"
+POLICY_CACHE_DIR = Path("reports") / ".rie_cache" / "policy"
+STATIC_CACHE_DIR = Path("reports") / ".rie_cache" / "static"
+RISK_CACHE_DIR = Path("reports") / ".rie_cache" / "risk"
+
+# Bump when the cached scan payload changes shape; the engine's own sources
+# are hashed into the key as well, so upgrading the tool misses the cache
+SCAN_CACHE_VERSION = 1
+
+# Keys every cached scan_data dict must carry (see run_clean's caller)
+SCAN_DATA_KEYS = ("repo_root", "file_data", "graph", "classified_entrypoints",
+                  "engine_scopes", "violations")
+
+# CLI flags that change the scan output (and therefore the cache key)
+SCAN_CACHE_FLAGS = ("no_trace", "k", "target", "surfaces", "trace_mode",
+                    "trace_timeout", "boot_timeout", "safe")
+
+
+def configure_logging(args):
+    """Send the "rie" logger to stdout; --quiet hides progress, -v adds detail."""
+    level = logging.INFO
+    if getattr(args, "quiet", False):
+        level = logging.WARNING
+    elif getattr(args, "verbose", False):
+        level = logging.DEBUG
+    logging.basicConfig(level=level, format="%(message)s", stream=sys.stdout)
+
+
+def scan_manifest(repo_root, all_files, config_hash, args) -> str:
+    """Hash every file's path, mtime and size plus config, flags and engine version into a cache key."""
+    manifest = hashlib.sha256()
+    manifest.update(f"v{SCAN_CACHE_VERSION}:{engine_fingerprint()}".encode())
+    for p in sorted(all_files):
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        manifest.update(str(p.relative_to(repo_root)).encode())
+        manifest.update(st.st_mtime_ns.to_bytes(8, "little", signed=True))
+        manifest.update(st.st_size.to_bytes(8, "little"))
+    manifest.update(config_hash.encode())
+    flags = {k: getattr(args, k, None) for k in SCAN_CACHE_FLAGS}
+    manifest.update(json.dumps(flags, sort_keys=True).encode())
+    return manifest.hexdigest()
+
+
+def _load_scan_cache(cache_path):
+    """Return the cached scan payload, or None on miss/corruption/unexpected shape."""
+    try:
+        with open(cache_path, "rb") as f:
+            payload = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        # Unpickling can fail in many ways on old or foreign payloads
+        # (KeyError, TypeError from __setstate__, ...): all are a miss
+        log.debug(f"  Scan cache unreadable, ignoring: {e!r}")
+        return None
+    if not (isinstance(payload, dict)
+            and isinstance(payload.get("final_report"), dict)
+            and isinstance(payload["final_report"].get("metadata"), dict)
+            and isinstance(payload.get("summary"), str)
+            and isinstance(payload.get("scan_data"), dict)
+            and all(k in payload["scan_data"] for k in SCAN_DATA_KEYS)):
+        log.debug("  Scan cache has an unexpected layout, ignoring")
+        return None
+    return payload
+
+
+def _save_scan_cache(cache_path, payload):
+    """Atomically write the scan payload and drop stale cache entries."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache_path)
+        for old in cache_path.parent.glob("*.pkl"):
+            if old != cache_path:
+                old.unlink()
+    except OSError as e:
+        log.debug(f"  Scan cache not written: {e}")
+
+
 def build_arg_parser(include_surgery=True):
     """Build the CLI argument parser.
     
@@ -60,6 +154,10 @@ def build_arg_parser(include_surgery=True):
     parser.add_argument("--boot-timeout", type=int, default=15, help="Timeout for infrastructure_boot entrypoints")
     parser.add_argument("--no-safe", action="store_false", dest="safe", help="Disable Simulation Mode")
     parser.set_defaults(safe=True)
+    parser.add_argument("-q", "--quiet", action="store_true", help="Only print warnings and errors")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print extra diagnostic detail")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not write the on-disk caches (reports/.rie_cache/)")
+    parser.add_argument("--compress-report", action="store_true", help="Also write a compressed usage_index.json (.zst, or .gz without zstandard)")
     
     if include_surgery:
         parser.add_argument("--prune", action="store_true", help="Generate a safe pruning plan and script")
@@ -79,13 +177,13 @@ def run_scan(repo_root, args):
     except ImportError:
         timestamp = datetime.utcnow().isoformat() + "Z"
     
-    print(f"--- Repository Integrity Engine v2.2: {repo_root} ---")
+    log.info(f"--- Repository Integrity Engine v2.2: {repo_root} ---")
     mode_label = "scan"
     if getattr(args, "prune", False):
         mode_label = "scan + prune"
     if getattr(args, "quarantine", False):
         mode_label = "scan + quarantine"
-    print(f"[MODE] {mode_label}" + (" [SAFE]" if args.safe else " [UNSAFE]"))
+    log.info(f"[MODE] {mode_label}" + (" [SAFE]" if args.safe else " [UNSAFE]"))
     
     # 0. Discovery
     all_files_list = {p for p in repo_root.rglob("*") if p.is_file() and ".git" not in p.parts and "reports" not in p.parts and "__pycache__" not in p.parts}
@@ -110,25 +208,52 @@ def run_scan(repo_root, args):
     config_prep = {"domains": domain_rules, "allowlist": allowlist, "repo": str(repo_root)}
     config_hash = "sha256:" + hashlib.sha256(json.dumps(config_prep, sort_keys=True).encode()).hexdigest()
     metadata = {"run_id": run_id, "timestamp": timestamp, "config_hash": config_hash}
+    log.debug(f"  Config hash: {config_hash}")
+
+    # Unchanged repo + config + flags: reuse the previous scan wholesale
+    cache_path = None
+    if not getattr(args, "no_cache", False):
+        cache_key = scan_manifest(repo_root, all_files_list, config_hash, args)
+        cache_path = repo_root / SCAN_CACHE_DIR / f"{cache_key}.pkl"
+        cached = _load_scan_cache(cache_path)
+        if cached is not None:
+            log.info("[CACHE] Repository unchanged since last scan -- reusing results.")
+            report = cached["final_report"]
+            report["metadata"].update({
+                "run_id": run_id,
+                "timestamp": timestamp,
+                "generated_at": datetime.utcnow().strftime(UTC_TIMESTAMP_FORMAT),
+            })
+            Reporter(repo_root, compress=getattr(args, "compress_report", False)).write_report(report)
+            log.info(cached["summary"])
+            return cached["scan_data"]
     
     resolver = DomainResolver(repo_root, domain_rules)
 
     # 1. Entrypoints (detect all -- we need the full list for reporting)
-    print("[1/6] Detecting entrypoints...")
+    log.info("[1/6] Detecting entrypoints...")
     detector = EntrypointDetector(repo_root)
     all_entrypoints = detector.detect_all()
-    print(f"  Found {len(all_entrypoints)} entrypoints.")
+    log.info(f"  Found {len(all_entrypoints)} entrypoints.")
 
     # Early scope resolution: figure out what to trace BEFORE tracing
     # Static analysis first (fast, no execution) to inform scope
-    print("[2/6] Static analysis...")
-    analyzer = StaticAnalyzer(repo_root)
+    log.info("[2/6] Static analysis...")
+    analyzer = StaticAnalyzer(repo_root,
+                              cache_dir=None if getattr(args, "no_cache", False)
+                              else repo_root / STATIC_CACHE_DIR)
     static_imports = analyzer.analyze_repo()
     static_edges = analyzer.get_edges()
-    print(f"  Found {len(static_imports)} statically imported files, {len(static_edges)} import edges.")
+    log.info(f"  Found {len(static_imports)} statically imported files, {len(static_edges)} import edges.")
     scanner = TextScanner(repo_root)
     text_refs = scanner.scan_all(all_files_list)
-    print(f"  Found {len(text_refs)} text-referenced files.")
+    log.info(f"  Found {len(text_refs)} text-referenced files.")
+
+    # Dynamic/risky code patterns (exec, eval, importlib, ...) per file
+    risk_summary = RiskAnalyzer(repo_root,
+                                cache_dir=None if getattr(args, "no_cache", False)
+                                else repo_root / RISK_CACHE_DIR).get_summary()
+    log.info(f"  {risk_summary['files_with_risks']} files use dynamic or risky patterns.")
 
     # Build preliminary file data for scope inference
     text_ref_files = set(text_refs.keys()) if isinstance(text_refs, dict) else set()
@@ -172,33 +297,33 @@ def run_scan(repo_root, args):
     surface_info = scope_resolver.detect_surfaces()
     surface_names = list(surface_info["surfaces"].keys())
     if surface_names:
-        print(f"  Surfaces: {', '.join(surface_names)}")
+        log.info(f"  Surfaces: {', '.join(surface_names)}")
     
     # --- TARGET RESOLUTION ---
     target_mode = args.target or "auto"
     
     if target_mode == "global":
         engine_scopes = ["."]
-        print(f"  Target: global (all surfaces)")
+        log.info(f"  Target: global (all surfaces)")
     elif target_mode == "engine":
         if engine_target_config:
             # User-defined engine roots
             engine_scopes = engine_target_config.get("include_roots", engine_scopes)
             exclude_patterns = engine_target_config.get("exclude", [])
-            print(f"  Target: engine (from engine_target.yml)")
-            print(f"  Include: {', '.join(engine_scopes)}")
+            log.info(f"  Target: engine (from engine_target.yml)")
+            log.info(f"  Include: {', '.join(engine_scopes)}")
             if exclude_patterns:
-                print(f"  Exclude: {', '.join(exclude_patterns)}")
+                log.info(f"  Exclude: {', '.join(exclude_patterns)}")
         else:
             # No config file -- use primary inferred scope only
             if len(engine_scopes) > 1:
                 engine_scopes = engine_scopes[:1]  # primary only
-            print(f"  Target: engine (inferred primary: {', '.join(engine_scopes)})")
-            print(f"  Tip: create engine_target.yml to define exact roots")
+            log.info(f"  Target: engine (inferred primary: {', '.join(engine_scopes)})")
+            log.info(f"  Tip: create engine_target.yml to define exact roots")
     elif target_mode != "auto":
         # Specific path
         engine_scopes = [target_mode]
-        print(f"  Target: {target_mode}")
+        log.info(f"  Target: {target_mode}")
 
     # Filter entrypoints to engine scope for tracing
     # Always excluded from tracing
@@ -234,15 +359,15 @@ def run_scan(repo_root, args):
     excluded_count = len(all_entrypoints) - len(scoped_entrypoints)
     
     if excluded_count > 0:
-        print(f"  Scoped to: {', '.join(engine_scopes)}")
-        print(f"  Tracing {len(scoped_entrypoints)} in-scope entrypoints ({excluded_count} excluded).")
+        log.info(f"  Scoped to: {', '.join(engine_scopes)}")
+        log.info(f"  Tracing {len(scoped_entrypoints)} in-scope entrypoints ({excluded_count} excluded).")
 
     # 3. Runtime Trace (scoped)
     runtime_files = set()
     relations = list(prelim_relations)  # start with static edges
     trace_meta = {"trace_mode": "disabled", "timeouts": [], "default_timeout": args.trace_timeout, "boot_timeout": args.boot_timeout, "entrypoints": []}
     if not args.no_trace and scoped_entrypoints:
-        print(f"[3/6] Runtime tracing ({len(scoped_entrypoints)} entrypoints)...")
+        log.info(f"[3/6] Runtime tracing ({len(scoped_entrypoints)} entrypoints)...")
         hint_tagger = EntryTagger(repo_root)
         entrypoint_hints = {}
         for ep in scoped_entrypoints:
@@ -263,7 +388,7 @@ def run_scan(repo_root, args):
         # Merge trace edges into relations
         relations.extend(trace_relations)
     elif args.no_trace:
-        print("[3/6] Skipping runtime tracing.")
+        log.info("[3/6] Skipping runtime tracing.")
 
     # Compute trace completeness -- surfaces where tracing is the signal source
     trace_attempted = len(trace_meta.get("entrypoints", []))
@@ -274,12 +399,12 @@ def run_scan(repo_root, args):
     trace_meta["completeness"] = round(trace_completeness, 4)
     trace_meta["partial"] = trace_completeness < 0.9
     if trace_meta["partial"]:
-        print(f"  WARNING: Trace completeness {trace_completeness:.0%} -- "
-              f"{trace_timeouts}/{trace_attempted} entrypoints timed out.")
-        print(f"  Static graph is primary signal source. Runtime data is supplemental.")
+        log.warning(f"  WARNING: Trace completeness {trace_completeness:.0%} -- "
+                    f"{trace_timeouts}/{trace_attempted} entrypoints timed out.")
+        log.warning(f"  Static graph is primary signal source. Runtime data is supplemental.")
 
     # LAYER 2: Synthesis -- merge runtime trace evidence into file data
-    print("[4/6] Building execution graph...")
+    log.info("[4/6] Building execution graph...")
     
     # Update prelim_data with runtime trace evidence
     p1_temp_data = []
@@ -311,7 +436,7 @@ def run_scan(repo_root, args):
     domains = cartography.detect_domains()
 
     # PHASE 4: Triangulation (engine_scopes already resolved above)
-    print("[5/6] Triangulating entrypoints...")
+    log.info("[5/6] Triangulating entrypoints...")
     triangulator = Triangulator(repo_root, graph, p1_temp_data)
     target = triangulator.get_target_set(mode="active_or_runtime")
     
@@ -327,9 +452,12 @@ def run_scan(repo_root, args):
     classified_entrypoints = tagger.tag_all()
 
     # PHASE 5: Enforcement
-    print("[6/6] Checking policy violations...")
+    log.info("[6/6] Checking policy violations...")
     enforcer = PolicyEnforcer(repo_root, p1_temp_data, graph, classified_entrypoints,
-                              surface_resolver=scope_resolver)
+                              surface_resolver=scope_resolver,
+                              path_to_surface=scope_resolver.path_to_surface,
+                              cache_dir=None if getattr(args, "no_cache", False)
+                              else repo_root / POLICY_CACHE_DIR)
     violations = enforcer.detect_violations()
     v_report = violations.get("tests_touching_runtime", {})
     total_v = v_report.get("summary", {}).get("total_violations", 0)
@@ -343,10 +471,10 @@ def run_scan(repo_root, args):
     edge_classification = scope_resolver.classify_edges(graph)
 
     # FINAL REPORT
-    reporter = Reporter(repo_root)
+    reporter = Reporter(repo_root, compress=getattr(args, "compress_report", False))
     final_report = reporter.generate(
         all_files_list, runtime_files, static_imports, text_refs, p1_temp_data,
-        phase_two_data={"graph": graph, "clusters": clusters},
+        phase_two_data={"graph": graph, "clusters": clusters, "risk": risk_summary},
         cartography_data={"folders": folders, "domains": domains},
         triangulation_data=triangulation_output,
         classified_entrypoints=classified_entrypoints,
@@ -363,236 +491,245 @@ def run_scan(repo_root, args):
         },
     )
 
-    # v2.1 Default Output Footer
-    print("-" * 79)
-    print("[OK] Scan complete.")
-    print("-" * 79)
-
-    # ---- BUILD CANDIDATE LIST WITH HARD GATING ----
-    # Candidates MUST satisfy ALL of:
-    #   1. in_engine_scope == True
-    #   2. eligible_for_primary == True
-    #   3. intent:runtime (not tests/docs/archive)
-    #   4. NOT matching deny patterns (tests/, archive/, docs/, __pycache__)
-    #   5. role in (infrastructure_boot, core_logic_driver, tooling_cli)
-    deny_prefixes = ("tests/", "test/", "archive/", "docs/", "doc/", "__pycache__/")
+    # Await the background report write even if building the footer fails
+    try:
+        # v2.1 Default Output Footer
+        # Collected into one buffer and emitted with a single write at the end.
+        out = []
+        out.append("-" * 79)
+        out.append("[OK] Scan complete.")
+        out.append("-" * 79)
+
+        # ---- BUILD CANDIDATE LIST WITH HARD GATING ----
+        # Candidates MUST satisfy ALL of:
+        #   1. in_engine_scope == True
+        #   2. eligible_for_primary == True
+        #   3. intent:runtime (not tests/docs/archive)
+        #   4. NOT matching deny patterns (tests/, archive/, docs/, __pycache__)
+        #   5. role in (infrastructure_boot, core_logic_driver, tooling_cli)
+        deny_prefixes = ("tests/", "test/", "archive/", "docs/", "doc/", "__pycache__/")
     
-    engine_candidates = []
-    for ep in classified_entrypoints:
-        path = ep.get("path", "")
+        engine_candidates = []
+        for ep in classified_entrypoints:
+            path = ep.get("path", "")
         
-        # Hard gate 1: must be in engine scope
-        if not ep.get("in_engine_scope", False):
-            continue
-        
-        # Hard gate 2: must be under one of the resolved engine roots
-        if engine_scopes and engine_scopes != ["."]:
-            in_root = any(
-                path == scope or path.startswith(scope + "/")
-                for scope in engine_scopes
-            )
-            if not in_root:
+            # Hard gate 1: must be in engine scope
+            if not ep.get("in_engine_scope", False):
                 continue
         
-        # Hard gate 3: deny patterns
-        path_lower = path.lower()
-        if any(path_lower.startswith(d) or ("/" + d) in path_lower for d in deny_prefixes):
-            continue
-        if "/test_" in path_lower or path_lower.split("/")[-1].startswith("test_"):
-            continue
+            # Hard gate 2: must be under one of the resolved engine roots
+            if engine_scopes and engine_scopes != ["."]:
+                in_root = any(
+                    path == scope or path.startswith(scope + "/")
+                    for scope in engine_scopes
+                )
+                if not in_root:
+                    continue
         
-        # Hard gate 4: must be eligible and runtime
-        if not ep.get("eligible_for_primary", False):
-            continue
-        intents = set(ep.get("intent_tags", []))
-        if "intent:runtime" not in intents:
-            continue
+            # Hard gate 3: deny patterns
+            path_lower = path.lower()
+            if any(path_lower.startswith(d) or ("/" + d) in path_lower for d in deny_prefixes):
+                continue
+            if "/test_" in path_lower or path_lower.split("/")[-1].startswith("test_"):
+                continue
         
-        # Hard gate 5: role check
-        role = ep.get("role", "")
-        if role not in ("infrastructure_boot", "core_logic_driver", "tooling_cli"):
-            continue
+            # Hard gate 4: must be eligible and runtime
+            if not ep.get("eligible_for_primary", False):
+                continue
+            intents = set(ep.get("intent_tags", []))
+            if "intent:runtime" not in intents:
+                continue
         
-        engine_candidates.append(ep)
-
-    engine_candidates.sort(key=lambda x: x.get("primary_candidate_score", 0), reverse=True)
-
-    # ---- DETERMINE SIGNAL QUALITY ----
-    trace_useful = len(runtime_files) > 5
-    static_useful = len(static_edges) > 10
-    signal_source = []
-    if trace_useful:
-        signal_source.append("runtime trace")
-    if static_useful:
-        signal_source.append("static import graph")
-    if not signal_source:
-        signal_source.append("naming heuristics + role scoring")
-
-    # ---- GROUP CANDIDATES BY SCOPE ----
-    scope_groups = {}
-    for ep in engine_candidates:
-        p = ep["path"]
-        matched_scope = "."
-        for scope in engine_scopes:
-            if scope != "." and (p == scope or p.startswith(scope + "/")):
-                matched_scope = scope
-                break
-        scope_groups.setdefault(matched_scope, []).append(ep)
-
-    # Rank scopes by total score
-    ranked_scopes = sorted(
-        scope_groups.keys(),
-        key=lambda s: sum(ep.get("primary_candidate_score", 0) for ep in scope_groups[s]),
-        reverse=True
-    )
+            # Hard gate 5: role check
+            role = ep.get("role", "")
+            if role not in ("infrastructure_boot", "core_logic_driver", "tooling_cli"):
+                continue
+        
+            engine_candidates.append(ep)
+
+        engine_candidates.sort(key=lambda x: x.get("primary_candidate_score", 0), reverse=True)
+
+        # ---- DETERMINE SIGNAL QUALITY ----
+        trace_useful = len(runtime_files) > 5
+        static_useful = len(static_edges) > 10
+        signal_source = []
+        if trace_useful:
+            signal_source.append("runtime trace")
+        if static_useful:
+            signal_source.append("static import graph")
+        if not signal_source:
+            signal_source.append("naming heuristics + role scoring")
+
+        # ---- GROUP CANDIDATES BY SCOPE ----
+        scope_groups = {}
+        for ep in engine_candidates:
+            p = ep["path"]
+            matched_scope = "."
+            for scope in engine_scopes:
+                if scope != "." and (p == scope or p.startswith(scope + "/")):
+                    matched_scope = scope
+                    break
+            scope_groups.setdefault(matched_scope, []).append(ep)
+
+        # Rank scopes by total score
+        ranked_scopes = sorted(
+            scope_groups.keys(),
+            key=lambda s: sum(ep.get("primary_candidate_score", 0) for ep in scope_groups[s]),
+            reverse=True
+        )
 
-    # Single-surface default: only show primary unless --surfaces all
-    show_all_surfaces = args.surfaces == "all"
-    primary_scope = ranked_scopes[0] if ranked_scopes else None
-    secondary_scopes = ranked_scopes[1:] if len(ranked_scopes) > 1 else []
+        # Single-surface default: only show primary unless --surfaces all
+        show_all_surfaces = args.surfaces == "all"
+        primary_scope = ranked_scopes[0] if ranked_scopes else None
+        secondary_scopes = ranked_scopes[1:] if len(ranked_scopes) > 1 else []
 
-    # ---- PRINT: START THE ENGINE ----
-    print(f"\n>> To start this project\n")
+        # ---- PRINT: START THE ENGINE ----
+        out.append(f"\n>> To start this project\n")
     
-    if not trace_useful and static_useful:
-        print(f"   Signal: {', '.join(signal_source)}")
-        print(f"   (Runtime trace was not useful; ranked by static graph + heuristics)\n")
-    elif signal_source:
-        print(f"   Signal: {', '.join(signal_source)}\n")
-
-    engine_paths = set()
+        if not trace_useful and static_useful:
+            out.append(f"   Signal: {', '.join(signal_source)}")
+            out.append(f"   (Runtime trace was not useful; ranked by static graph + heuristics)\n")
+        elif signal_source:
+            out.append(f"   Signal: {', '.join(signal_source)}\n")
+
+        engine_paths = set()
+
+        if not engine_candidates:
+            out.append("   No engine entrypoints identified in scope.\n")
+            if engine_scopes and engine_scopes != ["."]:
+                out.append(f"   Try: python3 main.py {repo_root} --target global --k 10\n")
+        elif primary_scope:
+            # Print primary surface
+            if engine_scopes and engine_scopes != ["."]:
+                out.append(f"   Engine scope: {primary_scope}/\n")
+        
+            primary_eps = scope_groups.get(primary_scope, [])
+            for idx, ep in enumerate(primary_eps[:args.k], start=1):
+                engine_paths.add(ep["path"])
+                score = int(ep.get("primary_candidate_score", 0.0) * 100)
+                role = ep.get("role", "unknown")
+                bd = ep.get("score_breakdown", {})
+                label = {"infrastructure_boot": "boot", "core_logic_driver": "core", "tooling_cli": "cli"}.get(role, role)
+                out.append(f"   {idx}. {ep['path']}")
+                out.append(f"      score: {score}  role: {label}  coverage: {bd.get('coverage', 0):.0%}  centrality: {bd.get('centrality', 0):.0%}")
+
+            top = primary_eps[0]
+            out.append(f"\n   Run it:")
+            out.append(f"     python3 {top['path']}")
+            if len(primary_eps) > 1 and primary_eps[1].get("role") != primary_eps[0].get("role"):
+                alt = primary_eps[1]
+                out.append(f"     python3 {alt['path']}  (alternative: {alt.get('role', '')})")
+
+            # Secondary surfaces
+            if secondary_scopes and show_all_surfaces:
+                for scope in secondary_scopes:
+                    scope_eps = scope_groups[scope]
+                    out.append(f"\n   Other surface: {scope}/")
+                    for idx, ep in enumerate(scope_eps[:args.k], start=1):
+                        engine_paths.add(ep["path"])
+                        score = int(ep.get("primary_candidate_score", 0.0) * 100)
+                        bd = ep.get("score_breakdown", {})
+                        label = {"infrastructure_boot": "boot", "core_logic_driver": "core", "tooling_cli": "cli"}.get(ep.get("role", ""), ep.get("role", ""))
+                        out.append(f"      {idx}. {ep['path']}")
+                        out.append(f"         score: {score}  role: {label}  coverage: {bd.get('coverage', 0):.0%}  centrality: {bd.get('centrality', 0):.0%}")
+                    out.append(f"      Run: python3 {scope_eps[0]['path']}")
+            elif secondary_scopes:
+                # Mention they exist without showing details
+                others = ", ".join(f"{s}/" for s in secondary_scopes)
+                out.append(f"\n   Other surfaces detected: {others}")
+                out.append(f"   Rerun with --surfaces all to see them.")
+
+        # ---- PRINT: AVAILABLE TOOLS ----
+        out.append(f"\n>> Tools and utilities\n")
+
+        tools = []
+        for ep in classified_entrypoints:
+            p = ep.get("path", "")
+            if not p or p in engine_paths:
+                continue
+            if ep.get("role") == "test_harness" or "test_" in p.lower().split("/")[-1]:
+                continue
+            intents = set(ep.get("intent_tags", []))
+            is_tool = "intent:tools" in intents or "intent:gui" in intents
+            out_of_scope = not ep.get("in_engine_scope", True)
+            if is_tool or out_of_scope:
+                tools.append(ep)
+
+        if tools:
+            by_domain = {}
+            for t in tools:
+                p1_entry = next((i for i in p1_temp_data if i["file"] == t["path"]), {})
+                dom = p1_entry.get("domain", "tools")
+                by_domain.setdefault(dom, []).append(t["path"])
+
+            for dom, files in sorted(by_domain.items()):
+                if files and dom != "unknown":
+                    out.append(f"   {dom:<20}: {files[0]}")
+        else:
+            out.append("   (none identified)")
+
+        # ---- PRINT: ISSUES ----
+        out.append(f"\n>> Issues\n")
+        out.append(f"   {total_v:<3} test boundary violations")
+        active_in_archive = len(violations.get("active_in_archive", []))
+        out.append(f"   {active_in_archive:<3} active files in archive/")
+        shadowed = len(violations.get("shadowed_modules", []))
+        out.append(f"   {shadowed:<3} shadowed modules")
+
+        # Cross-surface violations
+        cross_v = violations.get("cross_surface", {})
+        cross_total = cross_v.get("summary", {}).get("total_cross_edges", 0)
+        cross_unauth = cross_v.get("summary", {}).get("unauthorized", 0)
+        if cross_total > 0:
+            out.append(f"   {cross_total:<3} cross-surface edges ({cross_unauth} unauthorized)")
+            for pair, count in cross_v.get("summary", {}).get("by_pair", {}).items():
+                out.append(f"       {pair}: {count}")
 
-    if not engine_candidates:
-        print("   No engine entrypoints identified in scope.\n")
         if engine_scopes and engine_scopes != ["."]:
-            print(f"   Try: python3 main.py {repo_root} --target global --k 10\n")
-    elif primary_scope:
-        # Print primary surface
+            scope_target = {
+                rec["file"]
+                for rec in p1_temp_data
+                if any(rec["file"] == s or rec["file"].startswith(s + "/") for s in engine_scopes)
+            }
+            scope_covered = len(
+                scope_target.intersection({
+                    r["file"] for r in p1_temp_data if "runtime_trace" in r.get("evidence", []) or r["status"] == "ACTIVE"
+                })
+            )
+            scope_ratio = (scope_covered / len(scope_target)) if scope_target else 0.0
+            out.append(f"   Engine coverage: {scope_ratio:.0%} of {', '.join(engine_scopes)}")
+
+        # ---- PRINT: PER-SURFACE SUMMARY ----
+        if surface_metrics and len(surface_metrics) > 1:
+            out.append(f"\n>> Surface Breakdown\n")
+            for sid, m in sorted(surface_metrics.items(), key=lambda x: -x[1]["active"]):
+                cov_pct = f"{m['coverage']:.0%}"
+                out.append(f"   {sid:<24} {m['file_count']:>5} files  {m['active']:>4} active  "
+                      f"{m['runtime']:>3} traced  coverage: {cov_pct}")
+                if m["cross_edges_out"] > 0 or m["cross_edges_in"] > 0:
+                    out.append(f"   {'':24} cross: {m['cross_edges_out']} out / {m['cross_edges_in']} in")
+
+        # ---- PRINT: SCAN STATS ----
+        out.append(f"\n>> Scan stats\n")
+        out.append(f"   {len(all_files_list)} files scanned")
+        out.append(f"   {len(all_entrypoints)} entrypoints detected ({len(scoped_entrypoints)} in scope)")
+        out.append(f"   {len(runtime_files)} runtime-traced files")
+        out.append(f"   {len(static_imports)} statically imported, {len(static_edges)} import edges")
+        out.append(f"   {len(text_refs)} text-referenced files")
         if engine_scopes and engine_scopes != ["."]:
-            print(f"   Engine scope: {primary_scope}/\n")
-        
-        primary_eps = scope_groups.get(primary_scope, [])
-        for idx, ep in enumerate(primary_eps[:args.k], start=1):
-            engine_paths.add(ep["path"])
-            score = int(ep.get("primary_candidate_score", 0.0) * 100)
-            role = ep.get("role", "unknown")
-            bd = ep.get("score_breakdown", {})
-            label = {"infrastructure_boot": "boot", "core_logic_driver": "core", "tooling_cli": "cli"}.get(role, role)
-            print(f"   {idx}. {ep['path']}")
-            print(f"      score: {score}  role: {label}  coverage: {bd.get('coverage', 0):.0%}  centrality: {bd.get('centrality', 0):.0%}")
-
-        top = primary_eps[0]
-        print(f"\n   Run it:")
-        print(f"     python3 {top['path']}")
-        if len(primary_eps) > 1 and primary_eps[1].get("role") != primary_eps[0].get("role"):
-            alt = primary_eps[1]
-            print(f"     python3 {alt['path']}  (alternative: {alt.get('role', '')})")
-
-        # Secondary surfaces
-        if secondary_scopes and show_all_surfaces:
-            for scope in secondary_scopes:
-                scope_eps = scope_groups[scope]
-                print(f"\n   Other surface: {scope}/")
-                for idx, ep in enumerate(scope_eps[:args.k], start=1):
-                    engine_paths.add(ep["path"])
-                    score = int(ep.get("primary_candidate_score", 0.0) * 100)
-                    bd = ep.get("score_breakdown", {})
-                    label = {"infrastructure_boot": "boot", "core_logic_driver": "core", "tooling_cli": "cli"}.get(ep.get("role", ""), ep.get("role", ""))
-                    print(f"      {idx}. {ep['path']}")
-                    print(f"         score: {score}  role: {label}  coverage: {bd.get('coverage', 0):.0%}  centrality: {bd.get('centrality', 0):.0%}")
-                print(f"      Run: python3 {scope_eps[0]['path']}")
-        elif secondary_scopes:
-            # Mention they exist without showing details
-            others = ", ".join(f"{s}/" for s in secondary_scopes)
-            print(f"\n   Other surfaces detected: {others}")
-            print(f"   Rerun with --surfaces all to see them.")
-
-    # ---- PRINT: AVAILABLE TOOLS ----
-    print(f"\n>> Tools and utilities\n")
-
-    tools = []
-    for ep in classified_entrypoints:
-        p = ep.get("path", "")
-        if not p or p in engine_paths:
-            continue
-        if ep.get("role") == "test_harness" or "test_" in p.lower().split("/")[-1]:
-            continue
-        intents = set(ep.get("intent_tags", []))
-        is_tool = "intent:tools" in intents or "intent:gui" in intents
-        out_of_scope = not ep.get("in_engine_scope", True)
-        if is_tool or out_of_scope:
-            tools.append(ep)
-
-    if tools:
-        by_domain = {}
-        for t in tools:
-            p1_entry = next((i for i in p1_temp_data if i["file"] == t["path"]), {})
-            dom = p1_entry.get("domain", "tools")
-            by_domain.setdefault(dom, []).append(t["path"])
-
-        for dom, files in sorted(by_domain.items()):
-            if files and dom != "unknown":
-                print(f"   {dom:<20}: {files[0]}")
-    else:
-        print("   (none identified)")
-
-    # ---- PRINT: ISSUES ----
-    print(f"\n>> Issues\n")
-    print(f"   {total_v:<3} test boundary violations")
-    active_in_archive = sum(1 for f in p1_temp_data if f["status"] == "ACTIVE" and "archive" in f["file"].lower())
-    print(f"   {active_in_archive:<3} active files in archive/")
-    shadowed = len(violations.get("shadowed_modules", []))
-    print(f"   {shadowed:<3} shadowed modules")
-
-    # Cross-surface violations
-    cross_v = violations.get("cross_surface", {})
-    cross_total = cross_v.get("summary", {}).get("total_cross_edges", 0)
-    cross_unauth = cross_v.get("summary", {}).get("unauthorized", 0)
-    if cross_total > 0:
-        print(f"   {cross_total:<3} cross-surface edges ({cross_unauth} unauthorized)")
-        for pair, count in cross_v.get("summary", {}).get("by_pair", {}).items():
-            print(f"       {pair}: {count}")
-
-    if engine_scopes and engine_scopes != ["."]:
-        scope_target = {
-            rec["file"]
-            for rec in p1_temp_data
-            if any(rec["file"] == s or rec["file"].startswith(s + "/") for s in engine_scopes)
-        }
-        scope_covered = len(
-            scope_target.intersection({
-                r["file"] for r in p1_temp_data if "runtime_trace" in r.get("evidence", []) or r["status"] == "ACTIVE"
-            })
-        )
-        scope_ratio = (scope_covered / len(scope_target)) if scope_target else 0.0
-        print(f"   Engine coverage: {scope_ratio:.0%} of {', '.join(engine_scopes)}")
-
-    # ---- PRINT: PER-SURFACE SUMMARY ----
-    if surface_metrics and len(surface_metrics) > 1:
-        print(f"\n>> Surface Breakdown\n")
-        for sid, m in sorted(surface_metrics.items(), key=lambda x: -x[1]["active"]):
-            cov_pct = f"{m['coverage']:.0%}"
-            print(f"   {sid:<24} {m['file_count']:>5} files  {m['active']:>4} active  "
-                  f"{m['runtime']:>3} traced  coverage: {cov_pct}")
-            if m["cross_edges_out"] > 0 or m["cross_edges_in"] > 0:
-                print(f"   {'':24} cross: {m['cross_edges_out']} out / {m['cross_edges_in']} in")
-
-    # ---- PRINT: SCAN STATS ----
-    print(f"\n>> Scan stats\n")
-    print(f"   {len(all_files_list)} files scanned")
-    print(f"   {len(all_entrypoints)} entrypoints detected ({len(scoped_entrypoints)} in scope)")
-    print(f"   {len(runtime_files)} runtime-traced files")
-    print(f"   {len(static_imports)} statically imported, {len(static_edges)} import edges")
-    print(f"   {len(text_refs)} text-referenced files")
-    if engine_scopes and engine_scopes != ["."]:
-        print(f"   Inferred engine scope: {', '.join(engine_scopes)}")
-
-    print(f"\n   Full report: reports/usage_index.json")
-    print(f"   HTML viewer: reports/report_viewer.html")
-    print("-" * 79)
+            out.append(f"   Inferred engine scope: {', '.join(engine_scopes)}")
+
+        out.append(f"\n   Full report: reports/usage_index.json")
+        out.append(f"   HTML viewer: reports/report_viewer.html")
+        out.append("-" * 79)
+
+        summary = "\n".join(out)
+    finally:
+        reporter.flush()  # usage_index.json was written while the footer was built
+    log.info(summary)
 
     # Return scan state for clean.py / main() to consume
-    return {
+    scan_data = {
         "repo_root": repo_root,
         "file_data": p1_temp_data,
         "graph": graph,
@@ -602,6 +739,14 @@ def run_scan(repo_root, args):
         "violations": violations,
     }
 
+    if cache_path is not None:
+        _save_scan_cache(cache_path, {
+            "final_report": final_report,
+            "summary": summary,
+            "scan_data": scan_data,
+        })
+    return scan_data
+
 
 def run_clean(repo_root, file_data, graph, classified_entrypoints,
               engine_scopes, engine_target_config=None,
@@ -638,6 +783,8 @@ def main():
     if os.environ.get("__RIE_TRACING__"):
         return
 
+    configure_logging(args)
+
     repo_root = Path(args.repo).resolve()
     if not repo_root.exists():
         print(f"Error: Path {repo_root} does not exist.")
@@ -7,13 +7,180 @@ Detects architectural violations:
   - shadowed_modules: Module name collisions between active and archived versions
 """
 import ast
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
 from pathlib import Path
 from collections import defaultdict
+from collections.abc import Mapping
+from itertools import groupby, product
+from operator import itemgetter
+
+from engine_version import engine_fingerprint
+
+try:
+    import orjson  # Optional C-accelerated encoder
+except ImportError:
+    orjson = None
+
+log = logging.getLogger("rie")
+
+# Bump when the cached report layout changes; the engine fingerprint is
+# hashed into the key as well, so detector changes miss the cache
+POLICY_CACHE_VERSION = 1
+
+# Path classifiers: one compiled scan per path instead of several str checks
+# (same rules as the original checks: "archive/" anywhere or an "archive"
+# prefix; a "test"/"tests" path segment or a test_* leaf)
+ARCHIVE_PATH_RE = re.compile(r"^archive|archive/", re.IGNORECASE)
+TEST_PATH_RE = re.compile(r"(?:^|/)tests?(?:/|$)|(?:^|/)test_[^/]*$", re.IGNORECASE)
+
+# Runtime modules matching any of these segments are "core" (error severity)
+CORE_SEGMENTS_RE = re.compile(r"core/|engine/|runtime")
+
+
+# ----------------------------------------------------------------
+# Violation records
+# ----------------------------------------------------------------
+
+class Violation(Mapping):
+    """
+    Slotted violation record. Detectors can emit 10^4+ of these, so they
+    carry no per-instance __dict__; to_dict() gives the report's JSON shape
+    (keys in __slots__ order). Records are read-only mappings over their
+    slots, so `in`, dict(v), .items() and comparison with dicts behave as
+    they did for the plain dicts they replace. json.dump needs
+    default=violation_json_default (Reporter and the stream helpers pass it).
+    """
+    __slots__ = ()
+
+    def __init__(self, *args, **kwargs):
+        for name, value in zip(self.__slots__, args):
+            setattr(self, name, value)
+        for name, value in kwargs.items():
+            setattr(self, name, value)
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key):
+        return key in self.__slots__
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def get(self, key, default=None):
+        if key not in self.__slots__:
+            return default
+        return getattr(self, key, default)
+
+    def __eq__(self, other):
+        if isinstance(other, Mapping):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+
+class ActiveInArchive(Violation):
+    __slots__ = ("file", "evidence", "confidence")
+
+
+class ArchiveImport(Violation):
+    __slots__ = ("importer", "imported")
+
+
+class TestRuntimeViolation(Violation):
+    # View Contract keys -- must match report_viewer.html exactly
+    __slots__ = ("test_file", "runtime_module", "symbol", "edge_type",
+                 "severity", "evidence", "suggested_fix")
+
+
+class ShadowedModule(Violation):
+    __slots__ = ("module", "active_path", "archived_path")
+
+
+class CrossSurfaceViolation(Violation):
+    __slots__ = ("src_file", "dst_file", "src_surface", "dst_surface",
+                 "edge_type", "severity", "allowed", "suggested_fix")
+
+
+def violation_json_default(obj):
+    """json.dump default= hook: serialize Violation records as plain dicts."""
+    to_dict = getattr(obj, "to_dict", None)
+    if to_dict is not None:
+        return to_dict()
+    return str(obj)
+
+
+def _dumps(obj) -> bytes:
+    """Compact JSON bytes for one value, via orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=violation_json_default)
+    return json.dumps(obj, separators=(",", ":"),
+                      default=violation_json_default).encode("utf-8")
+
+
+def write_violations_json(result: dict, out):
+    """
+    Stream a detect_violations() report to a binary file object as JSON.
+
+    Violation lists are encoded one record at a time, so the whole report is
+    never held as a single encoded string.
+    """
+    def write_list(items):
+        out.write(b"[")
+        for i, item in enumerate(items):
+            if i:
+                out.write(b",")
+            out.write(_dumps(item))
+        out.write(b"]")
+
+    out.write(b"{")
+    for i, (key, section) in enumerate(result.items()):
+        if i:
+            out.write(b",")
+        out.write(_dumps(key) + b":")
+        if isinstance(section, list):
+            write_list(section)
+        elif isinstance(section, dict) and isinstance(section.get("violations"), list):
+            out.write(b'{"violations":')
+            write_list(section["violations"])
+            for k, v in section.items():
+                if k != "violations":
+                    out.write(b"," + _dumps(k) + b":" + _dumps(v))
+            out.write(b"}")
+        else:
+            out.write(_dumps(section))
+    out.write(b"}")
 
 
 class PolicyEnforcer:
     def __init__(self, repo_root: Path, file_data: list, graph: dict,
-                 classified_entrypoints: list = None, surface_resolver=None):
+                 classified_entrypoints: list = None, surface_resolver=None,
+                 path_to_surface: dict = None, cache_dir: Path = None):
         """
         Args:
             repo_root: repository root
@@ -21,15 +188,160 @@ class PolicyEnforcer:
             graph: adjacency list from GraphEngine
             classified_entrypoints: Phase 4.5 classified entrypoint list
             surface_resolver: ScopeResolver instance for cross-surface analysis
+            path_to_surface: precomputed file -> surface_id map (from
+                             ScopeResolver.tag_files) for O(1) edge lookups
+            cache_dir: directory for the detect_violations() disk cache
+                       (None disables caching)
         """
         self.repo_root = repo_root
+        # Intern every path so the detectors' set/dict lookups hit the
+        # identity fast path and each path string is stored once.
+        intern = sys.intern
+        for entry in file_data:
+            entry["file"] = intern(entry["file"])
         self.file_data = file_data
-        self.graph = graph
+        self.graph = {intern(src): {intern(t) for t in targets}
+                      for src, targets in graph.items()}
+        # The caller's graph, so classify_edges() shares ScopeResolver's memo
+        self._source_graph = graph
         self.classified_entrypoints = classified_entrypoints or []
         self.surface_resolver = surface_resolver
+        self.path_to_surface = path_to_surface
+        self.cache_dir = cache_dir
+        self.cache_stats = {"hits": 0, "misses": 0}
+        self._path_info = None  # Built lazily by _get_path_info()
+        self._test_files = set()
+        self._runtime_files = set()
+
+    def _get_path_info(self) -> dict:
+        """
+        Classify every path in file_data and the graph exactly once.
+
+        Returns: {path: {"is_archive", "is_test"}}
+        Detectors read from this index instead of re-classifying the same
+        path strings for every file and edge. The same pass partitions
+        file_data into self._test_files and self._runtime_files.
+        """
+        if self._path_info is not None:
+            return self._path_info
+
+        info = {}
+        is_archive = self._is_archive
+        is_test = self._is_test
+
+        def add(path):
+            if path not in info:
+                info[path] = {"is_archive": is_archive(path), "is_test": is_test(path)}
+
+        test_files = set()
+        runtime_files = set()
+        for entry in self.file_data:
+            rel = entry["file"]
+            add(rel)
+            rel_info = info[rel]
+            if rel_info["is_test"]:
+                test_files.add(rel)
+            elif not rel_info["is_archive"]:
+                runtime_files.add(rel)
+        self._test_files = test_files
+        self._runtime_files = runtime_files
+
+        for src, targets in self.graph.items():
+            add(src)
+            for tgt in targets:
+                add(tgt)
+
+        self._path_info = info
+        return info
 
     def detect_violations(self) -> dict:
-        """Run all violation checks and return a unified report."""
+        """Run all violation checks and return a unified report.
+
+        With a cache_dir, the report is stored under a hash of every input
+        the detectors read, and an unchanged repo reuses it.
+        """
+        if self.cache_dir is None:
+            return self._run_detectors()
+
+        cache_path = Path(self.cache_dir) / f"{self._cache_key()}.json"
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                result = self._rehydrate(json.load(f))
+            self.cache_stats["hits"] += 1
+            log.debug(f"  Policy cache: hit ({cache_path.name[:12]})")
+            return result
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            # Stale or foreign entries fail in many ways: all are a miss
+            log.debug(f"  Policy cache entry unusable, ignoring: {e!r}")
+
+        self.cache_stats["misses"] += 1
+        log.debug("  Policy cache: miss")
+        result = self._run_detectors()
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_path.with_suffix(".tmp")
+            with open(tmp, "wb") as f:
+                write_violations_json(result, f)
+            os.replace(tmp, cache_path)
+            for old in cache_path.parent.glob("*.json"):
+                if old != cache_path:
+                    old.unlink()
+        except OSError as e:
+            log.debug(f"  Policy cache not written: {e}")
+        return result
+
+    def detect_violations_to_stream(self, out) -> dict:
+        """Run detect_violations() and stream the report to `out` as JSON bytes."""
+        result = self.detect_violations()
+        write_violations_json(result, out)
+        return result
+
+    @staticmethod
+    def _rehydrate(result: dict) -> dict:
+        """Turn cached plain dicts back into Violation records.
+
+        Raises ValueError if a record's keys don't match its class's slots.
+        """
+        def records(cls, items):
+            slots = set(cls.__slots__)
+            out = []
+            for v in items:
+                if not isinstance(v, dict) or v.keys() != slots:
+                    raise ValueError(f"cached {cls.__name__} record has unexpected keys")
+                out.append(cls(**v))
+            return out
+
+        result["active_in_archive"] = records(ActiveInArchive, result["active_in_archive"])
+        result["imports_from_archive"] = records(ArchiveImport, result["imports_from_archive"])
+        result["shadowed_modules"] = records(ShadowedModule, result["shadowed_modules"])
+        trt = result["tests_touching_runtime"]
+        trt["violations"] = records(TestRuntimeViolation, trt["violations"])
+        if "cross_surface" in result:
+            cross = result["cross_surface"]
+            cross["violations"] = records(CrossSurfaceViolation, cross["violations"])
+        return result
+
+    def _cache_key(self) -> str:
+        """SHA256 over engine version, file records, graph edges and surface config."""
+        h = hashlib.sha256()
+        h.update(f"v{POLICY_CACHE_VERSION}:{engine_fingerprint()}".encode())
+        files = sorted(
+            (e["file"], e["status"], e.get("evidence", []), e.get("confidence", "LOW"))
+            for e in self.file_data
+        )
+        h.update(json.dumps(files, default=str).encode())
+        edges = sorted((src, sorted(targets)) for src, targets in self.graph.items())
+        h.update(json.dumps(edges).encode())
+        if self.surface_resolver:
+            surfaces = sorted((self.path_to_surface or self.surface_resolver.path_to_surface).items())
+            h.update(json.dumps([surfaces, self.surface_resolver.cross_allow],
+                                default=str).encode())
+        return h.hexdigest()
+
+    def _run_detectors(self) -> dict:
+        self._get_path_info()
         result = {
             "active_in_archive": self._detect_active_in_archive(),
             "imports_from_archive": self._detect_imports_from_archive(),
@@ -45,72 +357,62 @@ class PolicyEnforcer:
 
     def _detect_active_in_archive(self) -> list:
         """Find ACTIVE files that live in archive/ folders."""
+        info = self._get_path_info()
         violations = []
         for entry in self.file_data:
-            if entry["status"] == "ACTIVE" and self._is_archive(entry["file"]):
-                violations.append({
-                    "file": entry["file"],
-                    "evidence": entry.get("evidence", []),
-                    "confidence": entry.get("confidence", "LOW"),
-                })
+            if entry["status"] == "ACTIVE" and info[entry["file"]]["is_archive"]:
+                violations.append(ActiveInArchive(
+                    entry["file"], entry.get("evidence", []), entry.get("confidence", "LOW")))
         return violations
 
     def _detect_imports_from_archive(self) -> list:
         """Find non-archive files that import from archive/ paths."""
-        violations = []
-        for src, targets in self.graph.items():
-            if self._is_archive(src):
-                continue  # Skip archive -> archive imports
-            for tgt in targets:
-                if self._is_archive(tgt):
-                    violations.append({
-                        "importer": src,
-                        "imported": tgt,
-                    })
-        return violations
+        info = self._get_path_info()
+        # Skip archive -> archive imports
+        return [
+            ArchiveImport(src, tgt)
+            for src, targets in self.graph.items() if not info[src]["is_archive"]
+            for tgt in targets if info[tgt]["is_archive"]
+        ]
 
     def _detect_tests_touching_runtime(self) -> dict:
         """Find test files that import runtime modules directly."""
-        # Classify files by intent
-        test_files = set()
-        runtime_files = set()
-        for entry in self.file_data:
-            rel = entry["file"]
-            if self._is_test(rel):
-                test_files.add(rel)
-            elif not self._is_archive(rel) and not self._is_test(rel):
-                runtime_files.add(rel)
+        # Files were partitioned by intent while building the path index;
+        # only tests with outgoing edges can produce violations.
+        self._get_path_info()
+        runtime_files = self._runtime_files
+        graph = self.graph
+        test_files = [t for t in self._test_files if graph.get(t)] if runtime_files else []
+
+        # Per-runtime-module fields are fixed: build them once per module hit.
+        runtime_meta = {}
 
         violations = []
         by_test = defaultdict(int)
         by_runtime = defaultdict(int)
 
         for test_file in test_files:
-            imports = self.graph.get(test_file, set())
-            for imp in imports:
-                if imp in runtime_files:
-                    # Determine severity: core imports are errors, tools are warnings
-                    is_core = any(seg in imp for seg in ("core/", "engine/", "runtime"))
-                    severity = "error" if is_core else "warn"
-
-                    violations.append({
-                        # View Contract keys -- must match report_viewer.html exactly
-                        "test_file": test_file,
-                        "runtime_module": imp,
-                        "symbol": imp.rsplit("/", 1)[-1].replace(".py", ""),
-                        "edge_type": "static_import",
-                        "severity": severity,
-                        "evidence": "import graph",
-                        "suggested_fix": f"Mock or isolate {imp} behind an interface.",
-                    })
-                    by_test[test_file] += 1
-                    by_runtime[imp] += 1
+            for imp in graph[test_file] & runtime_files:
+                meta = runtime_meta.get(imp)
+                if meta is None:
+                    # Core imports are errors, tools are warnings
+                    is_core = CORE_SEGMENTS_RE.search(imp) is not None
+                    meta = runtime_meta[imp] = (
+                        imp.rsplit("/", 1)[-1].replace(".py", ""),
+                        "error" if is_core else "warn",
+                        f"Mock or isolate {imp} behind an interface.",
+                    )
+                symbol, severity, fix = meta
+                violations.append(TestRuntimeViolation(
+                    test_file, imp, symbol, "static_import", severity, "import graph", fix))
+                by_test[test_file] += 1
+                by_runtime[imp] += 1
 
         return {
             "violations": violations,
             "summary": {
                 "total_violations": len(violations),
-                "test_files_affected": len({v["test_file"] for v in violations}),
+                "test_files_affected": len({v.test_file for v in violations}),
                 "by_test_file": dict(by_test),
                 "by_runtime_module": dict(by_runtime),
             },
@@ -119,79 +421,83 @@ class PolicyEnforcer:
     def _detect_shadowed_modules(self) -> list:
         """Find module name collisions between archive and non-archive files."""
         # Group files by their leaf module name
-        by_name = defaultdict(list)
+        info = self._get_path_info()
+        keyed = []
         for entry in self.file_data:
             rel = entry["file"]
             if not rel.endswith(".py"):
                 continue
-            name = rel.split("/")[-1]
-            by_name[name].append(rel)
+            keyed.append((rel.rsplit("/", 1)[-1], rel))
+        keyed.sort(key=itemgetter(0))
 
         violations = []
-        for name, paths in by_name.items():
+        for name, group in groupby(keyed, key=itemgetter(0)):
+            paths = [rel for _, rel in group]
             if len(paths) < 2:
                 continue
-            
-            archive_paths = [p for p in paths if self._is_archive(p)]
-            active_paths = [p for p in paths if not self._is_archive(p)]
+
+            archive_paths = [p for p in paths if info[p]["is_archive"]]
+            active_paths = [p for p in paths if not info[p]["is_archive"]]
 
             if archive_paths and active_paths:
-                for active in active_paths:
-                    for archived in archive_paths:
-                        violations.append({
-                            "module": name,
-                            "active_path": active,
-                            "archived_path": archived,
-                        })
+                violations.extend(
+                    ShadowedModule(name, active, archived)
+                    for active, archived in product(active_paths, archive_paths)
+                )
 
         return violations
 
     @staticmethod
     def _is_archive(path: str) -> bool:
-        return "archive/" in path.lower() or path.lower().startswith("archive")
+        """True if the path contains "archive/" or starts with "archive"."""
+        return ARCHIVE_PATH_RE.search(path) is not None
 
     @staticmethod
     def _is_test(path: str) -> bool:
-        parts = path.lower().split("/")
-        return any(p in ("tests", "test") for p in parts) or parts[-1].startswith("test_")
+        return TEST_PATH_RE.search(path) is not None
 
     def _detect_cross_surface_violations(self) -> dict:
         """Detect unauthorized cross-surface imports."""
         if not self.surface_resolver:
             return {"violations": [], "summary": {}}
 
-        edge_info = self.surface_resolver.classify_edges(self.graph)
+        edge_info = self.surface_resolver.classify_edges(
+            self._source_graph, path_to_surface=self.path_to_surface)
         cross_edges = edge_info["cross"]
 
+        # Allowed/severity/fix depend only on the surface pair, and pairs
+        # repeat heavily across edges: resolve each distinct pair once.
+        pair_meta = {}
         violations = []
         by_pair = defaultdict(int)
 
         for src, dst, src_surface, dst_surface in cross_edges:
-            allowed = self.surface_resolver.is_cross_allowed(src_surface, dst_surface)
-            severity = "warn" if allowed else "error"
-
-            violations.append({
-                "src_file": src,
-                "dst_file": dst,
-                "src_surface": src_surface,
-                "dst_surface": dst_surface,
-                "edge_type": "cross_surface_import",
-                "severity": severity,
-                "allowed": allowed,
-                "suggested_fix": (
-                    f"Allowed by config." if allowed
+            pair = (src_surface, dst_surface)
+            meta = pair_meta.get(pair)
+            if meta is None:
+                allowed = self.surface_resolver.is_cross_allowed(src_surface, dst_surface)
+                meta = pair_meta[pair] = (
+                    allowed,
+                    "warn" if allowed else "error",
+                    "Allowed by config." if allowed
                     else f"Surface '{src_surface}' should not import from '{dst_surface}'. "
-                         f"Add to cross_surface.allow in engine_target.yml if intentional."
-                ),
-            })
-            by_pair[(src_surface, dst_surface)] += 1
+                         f"Add to cross_surface.allow in engine_target.yml if intentional.",
+                )
+            allowed, severity, fix = meta
+
+            violations.append(CrossSurfaceViolation(
+                src, dst, src_surface, dst_surface, "cross_surface_import",
+                severity, allowed, fix))
+            by_pair[pair] += 1
+
+        allowed_count = sum(n for pair, n in by_pair.items() if pair_meta[pair][0])
 
         return {
             "violations": violations,
             "summary": {
                 "total_cross_edges": len(cross_edges),
-                "unauthorized": sum(1 for v in violations if not v["allowed"]),
-                "allowed": sum(1 for v in violations if v["allowed"]),
+                "unauthorized": len(violations) - allowed_count,
+                "allowed": allowed_count,
                 "by_pair": {f"{k[0]}->{k[1]}": v for k, v in by_pair.items()},
             },
         }
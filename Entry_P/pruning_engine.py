@@ -4,11 +4,17 @@ Generates a safe, reviewable pruning plan and shell script.
 Safety hierarchy: move active files first, then delete legacy, then remove empty folders.
 """
 import os
+import re
 from pathlib import Path
 import shutil
 import uuid
-from collections import defaultdict
 from undo_manager import UndoManager
+from policy_enforcer import ARCHIVE_PATH_RE
+
+# Archived paths containing any of these are suggested a tools/ destination
+TOOL_KEYWORDS = ("anim", "rig", "asset", "tool")
+# All keywords in one alternation: a single pass over the path per lookup
+TOOL_KEYWORDS_RE = re.compile("|".join(map(re.escape, TOOL_KEYWORDS)))
 
 
 class PruningEngine:
@@ -29,12 +35,23 @@ class PruningEngine:
         """
         engine_set = set(engine_roots)
 
-        # Classify folders
-        folder_files = defaultdict(list)
+        # One pass over file_data builds a per-folder rollup:
+        # folder -> [active files, legacy files, has_engine]
+        rollup = {}
         for entry in self.file_data:
-            parts = entry["file"].split("/")
-            folder = "/".join(parts[:-1]) if len(parts) > 1 else "."
-            folder_files[folder].append(entry)
+            rel = entry["file"]
+            folder, sep, _ = rel.rpartition("/")
+            folder = folder if sep else "."
+            record = rollup.get(folder)
+            if record is None:
+                record = rollup[folder] = [[], [], False]
+            status = entry["status"]
+            if status == "ACTIVE":
+                record[0].append(entry)
+            elif status == "LEGACY":
+                record[1].append(entry)
+            if rel in engine_set:
+                record[2] = True
 
         full_removal = []
         partial_prune = []
@@ -43,18 +60,23 @@ class PruningEngine:
         # Folders that should never be suggested for full removal
         protected_prefixes = {"docs", "doc", "tests", "test", "tools", ".uacf_undo", "."}
 
-        for folder, files in sorted(folder_files.items()):
-            active = [f for f in files if f["status"] == "ACTIVE"]
-            legacy = [f for f in files if f["status"] == "LEGACY"]
+        for folder in sorted(rollup):
+            active, legacy, has_engine = rollup[folder]
 
             # Skip root-level and engine-containing folders
-            if folder == ".":
+            if folder == "." or has_engine:
                 continue
-            if any(f["file"] in engine_set for f in files):
+
+            # Every file in a folder shares its archive status
+            folder_lower = folder.lower()
+            in_archive = ARCHIVE_PATH_RE.search(folder_lower + "/") is not None
+
+            # All-active folders outside archive/ need no action
+            if not legacy and not in_archive:
                 continue
 
             # Skip protected folders for full removal
-            top_folder = folder.split("/")[0].lower()
+            top_folder = folder_lower.split("/", 1)[0]
             is_protected = top_folder in protected_prefixes
 
             if not active and legacy and not is_protected:
@@ -73,10 +95,10 @@ class PruningEngine:
                 })
 
             # Check for active-in-archive that should be moved
-            for f in active:
-                if "archive/" in f["file"].lower() or f["file"].lower().startswith("archive"):
+            if in_archive:
+                for f in active:
                     # Suggest moving out of archive
-                    dest = self._suggest_destination(f["file"])
+                    dest = self._suggest_destination(f["file"], f["file"].lower())
                     move_candidates.append({
                         "source": f["file"],
                         "destination": dest,
@@ -94,57 +116,57 @@ class PruningEngine:
             },
         }
 
-    def apply_plan(self, plan: dict, dry_run: bool = False) -> dict:
+    def apply_plan(self, plan: dict, dry_run: bool = False, verbose: bool = True) -> dict:
         """
         Apply the pruning plan using Python operations.
         Logs to UndoManager for traceability and undo support.
+        Each phase is applied as one UndoManager batch (one ledger write
+        before and after) instead of one ledger rewrite per file.
+        With dry_run and verbose=False, nothing is printed.
         """
-        undo = UndoManager(self.repo_root)
         session_id = str(uuid.uuid4())
         results = {
             "session_id": session_id,
             "dry_run": dry_run,
             "actions": []
         }
-
-        print(f"{'[DRY-RUN] ' if dry_run else ''}Applying pruning plan (Session: {session_id[:8]})...")
-
-        # Phase 1: Moves (safety first)
-        for m in plan.get("move_candidates", []):
-            src = m["source"]
-            dst = m["destination"]
-            msg = f"Move {src} -> {dst}"
-            if dry_run:
-                results["actions"].append({"type": "move", "status": "dry_run", "msg": msg})
-                print(f"  [DRY] {msg}")
-            else:
-                success = undo.move_file(src, dst, session_id=session_id)
-                results["actions"].append({"type": "move", "status": "done" if success else "failed", "msg": msg})
-                print(f"  {'✅' if success else '❌'} {msg}")
-
-        # Phase 2: Partial prunes
-        for p in plan.get("partial_prune_candidates", []):
-            for f in p["files_to_remove"]:
-                msg = f"Delete {f} (partial prune)"
-                if dry_run:
-                    results["actions"].append({"type": "delete", "status": "dry_run", "msg": msg})
-                    print(f"  [DRY] {msg}")
-                else:
-                    success = undo.move_to_trash(f, session_id=session_id)
-                    results["actions"].append({"type": "delete", "status": "done" if success else "failed", "msg": msg})
-                    print(f"  {'✅' if success else '❌'} {msg}")
-
-        # Phase 3: Full folder removals
-        for r in plan.get("full_removal_candidates", []):
-            folder = r["folder"]
-            msg = f"Delete folder {folder} ({r['file_count']} files)"
+        actions = results["actions"]
+        show = verbose or not dry_run
+
+        if show:
+            print(f"{'[DRY-RUN] ' if dry_run else ''}Applying pruning plan (Session: {session_id[:8]})...")
+
+        moves = [(m["source"], m["destination"]) for m in plan.get("move_candidates", ())]
+        partial = [f for p in plan.get("partial_prune_candidates", ()) for f in p["files_to_remove"]]
+        folders = [(r["folder"], r["file_count"]) for r in plan.get("full_removal_candidates", ())]
+
+        # Safety first: moves, then partial prunes, then full folder removals
+        phases = (
+            ("move", ["Move %s -> %s" % pair for pair in moves], moves),
+            ("delete", ["Delete %s (partial prune)" % f for f in partial], partial),
+            ("delete_folder", ["Delete folder %s (%d files)" % r for r in folders],
+             [folder for folder, _ in folders]),
+        )
+
+        undo = None if dry_run else UndoManager(self.repo_root)
+        lines = []
+        for action_type, msgs, items in phases:
+            if not msgs:
+                continue
             if dry_run:
-                results["actions"].append({"type": "delete_folder", "status": "dry_run", "msg": msg})
-                print(f"  [DRY] {msg}")
+                actions.extend({"type": action_type, "status": "dry_run", "msg": msg} for msg in msgs)
+                lines.extend("  [DRY] " + msg for msg in msgs)
+                continue
+            if action_type == "move":
+                outcomes = undo.batch_move(items, session_id=session_id)
             else:
-                success = undo.move_to_trash(folder, session_id=session_id)
-                results["actions"].append({"type": "delete_folder", "status": "done" if success else "failed", "msg": msg})
-                print(f"  {'✅' if success else '❌'} {msg}")
+                outcomes = undo.batch_trash(items, session_id=session_id)
+            for msg, success in zip(msgs, outcomes):
+                actions.append({"type": action_type, "status": "done" if success else "failed", "msg": msg})
+                lines.append(f"  {'✅' if success else '❌'} {msg}")
+
+        if show and lines:
+            print("\n".join(lines))
 
         return results
 
@@ -162,13 +184,24 @@ class PruningEngine:
         return self.materialize(plan)
 
     @staticmethod
-    def _suggest_destination(archive_path: str) -> str:
-        """Suggest a non-archive destination for an active file in archive/."""
-        # Remove archive/ prefix and suggest tools/ or runtime/
-        parts = archive_path.split("/")
-        # Find and remove the 'archive' segment
-        clean_parts = [p for p in parts if p.lower() != "archive"]
-        
-        if any(kw in archive_path.lower() for kw in ("anim", "rig", "asset", "tool")):
-            return "tools/" + "/".join(clean_parts)
-        return "runtime/" + "/".join(clean_parts)
+    def _suggest_destination(archive_path: str, lower: str = None) -> str:
+        """Suggest a non-archive destination for an active file in archive/.
+
+        `lower` is archive_path.lower() when the caller already has it.
+        """
+        if lower is None:
+            lower = archive_path.lower()
+        prefix = "tools/" if TOOL_KEYWORDS_RE.search(lower) else "runtime/"
+
+        # Remove 'archive' segments (case-insensitive) by slicing the
+        # "/"-padded path rather than splitting and re-joining it
+        padded_lower = "/" + lower + "/"
+        if "/archive/" not in padded_lower:
+            return prefix + archive_path
+        padded = "/" + archive_path + "/"
+        i = padded_lower.find("/archive/")
+        while i != -1:
+            padded = padded[:i] + padded[i + 8:]
+            padded_lower = padded_lower[:i] + padded_lower[i + 8:]
+            i = padded_lower.find("/archive/", i)
+        return prefix + padded[1:-1]
@@ -16,36 +16,70 @@ Usage:
     plan = q.build_plan()
     q.write_scripts(plan)
 """
+import errno
+import hashlib
 import json
+import logging
 import os
 import re
-from collections import defaultdict
+import shutil
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from static_analyzer import IGNORE_DIRS
 
-# Patterns that indicate legacy/shadow files
-SHADOW_PATTERNS = [
-    re.compile(r'_old\.py$', re.I),
-    re.compile(r'_v\d+\.py$', re.I),
-    re.compile(r'_backup\.py$', re.I),
-    re.compile(r'_deprecated\.py$', re.I),
-    re.compile(r'_legacy\.py$', re.I),
-    re.compile(r'_bak\.py$', re.I),
-    re.compile(r'\.bak$', re.I),
-    re.compile(r'_copy\.py$', re.I),
-    re.compile(r'_orig\.py$', re.I),
-]
+try:
+    import orjson  # Optional C-accelerated encoder for large plans
+except ImportError:
+    orjson = None
+
+log = logging.getLogger("rie")
+
+
+# Literal suffixes (lowercase) that indicate legacy/shadow files; matched
+# with one C-level str.endswith call. Versioned names (_v2.py) are the only
+# pattern that needs a regex.
+SHADOW_SUFFIXES = (
+    "_old.py", "_backup.py", "_deprecated.py", "_legacy.py",
+    "_bak.py", ".bak", "_copy.py", "_orig.py",
+)
+SHADOW_VERSION_RE = re.compile(r'_v\d+\.py$')
+
+# Above this many engine scopes, _in_engine_scope walks a segment trie
+# instead of testing every scope prefix
+SCOPE_TRIE_MIN = 4
+_SCOPE_END = object()
+
+# Upper bound on threads used by apply() to overlap file moves
+MAX_MOVE_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Directories never entered by the empty-dir cleanup: everything the
+# analyzers ignore (VCS metadata, environments, caches, reports) plus other
+# VCS dirs; they also keep their parent directory alive
+CLEANUP_SKIP_DIRS = IGNORE_DIRS | {".hg", ".svn"}
 
 # Directories that are always periphery (T1) unless in engine scope
-DEFAULT_PERIPHERY = {
+DEFAULT_PERIPHERY = frozenset({
     "gui", "tools", "scripts", "docs", "doc", "examples", "samples",
     "bench", "benchmark", "vendor", "third_party", "external",
-}
+})
+
+
+def _rename_or_move(src, dst):
+    """os.rename (one syscall) when src and dst share a filesystem, else shutil.move."""
+    try:
+        os.rename(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(src, dst)
 
 
 class QuarantineEngine:
     def __init__(self, repo_root, file_data, graph, engine_candidates,
-                 engine_scopes, engine_target_config=None):
+                 engine_scopes, engine_target_config=None, core_files=None):
         """
         Args:
             repo_root: Path to repository root
@@ -54,6 +88,8 @@ class QuarantineEngine:
             engine_candidates: list of classified entrypoints (from EntryTagger)
             engine_scopes: list of scope prefixes (e.g. ["godotengain/engainos"])
             engine_target_config: dict from engine_target.yml (optional)
+            core_files: precomputed reachable set from a previous engine on
+                        the same graph and candidates (optional; skips the BFS)
         """
         self.repo_root = Path(repo_root)
         self.file_data = file_data
@@ -69,8 +105,22 @@ class QuarantineEngine:
         # Pre-compute file lookup
         self.file_map = {f["file"]: f for f in file_data}
 
+        # Pre-compute scope matching (see _in_engine_scope)
+        self._all_scope = self.engine_scopes == ["."]
+        self._scope_set = frozenset(self.engine_scopes)
+        self._scope_prefixes = tuple(s + "/" for s in self.engine_scopes)
+        self._scope_trie = None
+        self._scope_cache = {}  # parent dir -> in scope
+        if len(self.engine_scopes) > SCOPE_TRIE_MIN:
+            self._scope_trie = {}
+            for scope in self.engine_scopes:
+                node = self._scope_trie
+                for seg in scope.split("/"):
+                    node = node.setdefault(seg, {})
+                node[_SCOPE_END] = True
+
         # Pre-compute reachable set from engine entrypoints
-        self.core_files = self._compute_core_set()
+        self.core_files = set(core_files) if core_files is not None else self._compute_core_set()
 
     def _compute_core_set(self):
         """
@@ -85,15 +135,18 @@ class QuarantineEngine:
             if ep.get("eligible_for_primary"):
                 seeds.add(ep["path"])
 
-        # BFS through graph
-        queue = list(seeds)
+        # BFS through graph. Nodes join core when enqueued, so each node is
+        # queued at most once even when many modules import it.
+        core.update(seeds)
+        queue = deque(seeds)
+        graph_get = self.graph.get
         while queue:
-            node = queue.pop(0)
-            if node in core:
+            neighbors = graph_get(queue.popleft())
+            if not neighbors:
                 continue
-            core.add(node)
-            for neighbor in self.graph.get(node, set()):
+            for neighbor in neighbors:
                 if neighbor not in core:
+                    core.add(neighbor)
                     queue.append(neighbor)
 
         return core
@@ -116,7 +169,17 @@ class QuarantineEngine:
         t2 = []  # Shadow -- move second
         t3 = []  # Ghost -- automated prune
 
-        exclude_dirs = set(self.target_config.get("exclude", []))
+        exclude_dirs = frozenset(self.target_config.get("exclude", []))
+
+        # Hot-loop lookups bound to locals
+        core = self.core_files
+        periphery = DEFAULT_PERIPHERY
+        in_engine_scope = self._in_engine_scope
+        matches_shadow = self._matches_shadow
+
+        # Directory rules depend only on the top-level directory, so each
+        # distinct top_dir is decided once: top_dir -> T1 reason or None
+        top_dir_rule = {}
 
         for entry in self.file_data:
             path = entry["file"]
@@ -133,48 +196,52 @@ class QuarantineEngine:
             }
 
             # T0: Core -- reachable from engine entrypoints
-            if path in self.core_files:
+            if path in core:
                 tier_info["reason"] = "reachable from engine entrypoint"
                 t0.append(tier_info)
                 continue
 
-            # T0: Anything in engine scope with HIGH confidence
-            in_scope = self._in_engine_scope(path)
-            if in_scope and confidence == "HIGH":
-                tier_info["reason"] = "in-scope + runtime traced"
-                t0.append(tier_info)
-                continue
-
-            # T0: Anything in engine scope with evidence
-            if in_scope and evidence and status == "ACTIVE":
-                tier_info["reason"] = "in-scope + active with evidence"
-                t0.append(tier_info)
-                continue
+            # T0: Anything in engine scope with HIGH confidence, or active
+            # with evidence. One scope test gates both checks.
+            in_scope = in_engine_scope(path)
+            if in_scope:
+                if confidence == "HIGH":
+                    tier_info["reason"] = "in-scope + runtime traced"
+                    t0.append(tier_info)
+                    continue
+                if evidence and status == "ACTIVE":
+                    tier_info["reason"] = "in-scope + active with evidence"
+                    t0.append(tier_info)
+                    continue
 
-            # Check path segments for classification
-            parts = path.replace("\\", "/").lower().split("/")
-            top_dir = parts[0] if parts else ""
+            # Normalize once; top_dir and the archive-segment test are
+            # answered from this string without building a parts list
+            norm = path.replace("\\", "/").lower()
+            top_dir = norm.split("/", 1)[0]
 
             # T2: Archive or legacy patterns
-            if "archive" in parts or self._matches_shadow(path):
+            if "/archive/" in f"/{norm}/" or matches_shadow(path, norm):
                 tier_info["reason"] = "archive or legacy pattern"
                 t2.append(tier_info)
                 continue
 
-            # T1: Explicitly excluded directories
-            if top_dir in exclude_dirs:
-                tier_info["reason"] = f"excluded by engine_target.yml ({top_dir}/)"
-                t1.append(tier_info)
-                continue
-
-            # T1: Default periphery directories
-            if top_dir in DEFAULT_PERIPHERY:
-                tier_info["reason"] = f"periphery directory ({top_dir}/)"
+            # T1: Explicitly excluded or default periphery directories
+            if top_dir in top_dir_rule:
+                dir_reason = top_dir_rule[top_dir]
+            elif top_dir in exclude_dirs:
+                dir_reason = top_dir_rule[top_dir] = f"excluded by engine_target.yml ({top_dir}/)"
+            elif top_dir in periphery:
+                dir_reason = top_dir_rule[top_dir] = f"periphery directory ({top_dir}/)"
+            else:
+                dir_reason = top_dir_rule[top_dir] = None
+            if dir_reason is not None:
+                tier_info["reason"] = dir_reason
                 t1.append(tier_info)
                 continue
 
-            # T1: Out of engine scope entirely
-            if not in_scope and self.engine_scopes != ["."]:
+            # T1: Out of engine scope entirely (in_scope is always True
+            # without explicit scopes)
+            if not in_scope:
                 tier_info["reason"] = "outside engine scope"
                 t1.append(tier_info)
                 continue
@@ -227,12 +294,16 @@ class QuarantineEngine:
 
         # 1. Write plan JSON
         plan_path = out / "quarantine_plan.json"
-        with open(plan_path, "w") as f:
-            json.dump(plan, f, indent=2)
-
-        # 2. Write quarantine.sh
+        if orjson is not None:
+            plan_bytes = orjson.dumps(plan, option=orjson.OPT_INDENT_2)
+        else:
+            plan_bytes = json.dumps(plan, indent=2).encode("utf-8")
+        with open(plan_path, "wb") as f:
+            f.write(plan_bytes)
+
+        # 2. Write quarantine.sh (pinned to this exact plan file)
         script_path = out / "quarantine.sh"
-        self._write_move_script(plan, script_path)
+        self._write_move_script(plan, script_path, hashlib.sha256(plan_bytes).hexdigest())
 
         # 3. Write restore.sh
         restore_path = out / "restore.sh"
@@ -261,8 +332,12 @@ class QuarantineEngine:
 
         return plan_path, script_path, restore_path
 
-    def _write_move_script(self, plan, script_path):
-        """Generate the quarantine bash script with tier support."""
+    def _write_move_script(self, plan, script_path, plan_sha256):
+        """Generate the quarantine bash script with tier support.
+
+        The script reads its file lists from the plan JSON and refuses to
+        run if that file no longer hashes to plan_sha256.
+        """
         lines = [
             "#!/bin/bash",
             "# Quarantine script -- generated by Repository Integrity Engine",
@@ -272,6 +347,8 @@ class QuarantineEngine:
             "#   bash quarantine.sh tier3          # Move ghosts (zero evidence)",
             "#   bash quarantine.sh all            # Move everything movable",
             "#",
+            "# File lists are read from quarantine_plan.json next to this script;",
+            "# the script refuses to run if that plan has changed since generation.",
             "# Each tier writes to _quarantine/move_manifest.json for restore.",
             "# Run restore.sh to undo all moves.",
             "",
@@ -279,6 +356,9 @@ class QuarantineEngine:
             f'REPO_ROOT="{self.repo_root}"',
             f'QUARANTINE_DIR="{self.quarantine_dir}"',
             'MANIFEST="$QUARANTINE_DIR/move_manifest.json"',
+            f'PLAN="{script_path.parent / "quarantine_plan.json"}"',
+            f'PLAN_SHA256="{plan_sha256}"',
+            'PLAN_LIST="$(mktemp)"',
             '',
             '# Initialize manifest if it does not exist',
             'mkdir -p "$QUARANTINE_DIR"',
@@ -286,6 +366,25 @@ class QuarantineEngine:
             '    echo "[]" > "$MANIFEST"',
             'fi',
             '',
+            '# Moves are recorded as NUL-separated (src, dst, tier) fields and',
+            '# merged into the manifest by one python3 call on exit (even on error)',
+            'MOVES_LOG="$(mktemp)"',
+            'flush_manifest() {',
+            '    if [ -s "$MOVES_LOG" ]; then',
+            "        python3 -c '",
+            "import json, os, sys",
+            "with open(sys.argv[1], \"r\") as f: data = json.load(f)",
+            "with open(sys.argv[2], \"rb\") as f: fields = f.read().split(b\"\\0\")[:-1]",
+            "fields = [os.fsdecode(x) for x in fields]",
+            "for i in range(0, len(fields) - 2, 3):",
+            '    data.append({"src": fields[i], "dst": fields[i + 1], "tier": fields[i + 2]})',
+            "with open(sys.argv[1], \"w\") as f: json.dump(data, f, indent=2)",
+            "' \"$MANIFEST\" \"$MOVES_LOG\"",
+            '    fi',
+            '    rm -f "$MOVES_LOG" "$PLAN_LIST"',
+            '}',
+            'trap flush_manifest EXIT',
+            '',
             'move_file() {',
             '    local src="$1"',
             '    local tier="$2"',
@@ -295,47 +394,72 @@ class QuarantineEngine:
             '    fi',
             '    mkdir -p "$(dirname "$dst")"',
             '    mv "$REPO_ROOT/$src" "$dst"',
-            '    # Append to manifest',
-            "    python3 -c '",
-            "import json, sys",
-            "with open(sys.argv[1], \"r\") as f: data = json.load(f)",
-            'data.append({"src": sys.argv[2], "dst": sys.argv[3], "tier": sys.argv[4]})',
-            "with open(sys.argv[1], \"w\") as f: json.dump(data, f, indent=2)",
-            "' \"$MANIFEST\" \"$REPO_ROOT/$src\" \"$dst\" \"$tier\"",
+            "    printf '%s\\0%s\\0%s\\0' \"$REPO_ROOT/$src\" \"$dst\" \"$tier\" >> \"$MOVES_LOG\"",
             '    echo "  moved: $src"',
             '}',
             '',
         ]
 
-        # Tier 1 function
-        lines.append('move_tier1() {')
-        lines.append('    echo ">> Moving T1: Periphery (low risk)..."')
-        for entry in plan["t1_periphery"]:
-            lines.append(f'    move_file "{entry["file"]}" "tier1"')
-        lines.append('    echo "  T1 done."')
-        lines.append('}')
-        lines.append('')
-
-        # Tier 2 function
-        lines.append('move_tier2() {')
-        lines.append('    echo ">> Moving T2: Shadows (medium risk)..."')
-        for entry in plan["t2_shadow"]:
-            lines.append(f'    move_file "{entry["file"]}" "tier2"')
-        lines.append('    echo "  T2 done."')
-        lines.append('}')
-        lines.append('')
-
-        # Tier 3 function
-        lines.append('move_tier3() {')
-        lines.append('    echo ">> Moving T3: Ghosts (zero evidence)..."')
-        for entry in plan["t3_ghost"]:
-            lines.append(f'    move_file "{entry["file"]}" "tier3"')
-        lines.append('    echo "  T3 done."')
-        lines.append('}')
-        lines.append('')
+        # Tier functions read their file list from the plan JSON, so the
+        # script stays the same size however many files are planned
+        lines.extend([
+            '# Abort unless the plan exists, parses, and is the one this script was made for',
+            'check_plan() {',
+            '    if [ ! -f "$PLAN" ]; then',
+            '        echo "Plan not found: $PLAN" >&2',
+            '        exit 1',
+            '    fi',
+            "    python3 -c '",
+            "import hashlib, json, sys",
+            "with open(sys.argv[1], \"rb\") as f: data = f.read()",
+            "if hashlib.sha256(data).hexdigest() != sys.argv[2]:",
+            "    sys.exit(\"Plan changed since this script was generated: \" + sys.argv[1])",
+            "json.loads(data)",
+            "' \"$PLAN\" \"$PLAN_SHA256\"",
+            '}',
+            '',
+            '# NUL-separated file paths of one tier in the plan',
+            'plan_files() {',
+            "    python3 -c '",
+            "import json, os, sys",
+            "with open(sys.argv[1], \"r\") as f: plan = json.load(f)",
+            "for entry in plan.get(sys.argv[2], []):",
+            "    sys.stdout.buffer.write(os.fsencode(entry[\"file\"]) + b\"\\0\")",
+            "' \"$PLAN\" \"$1\"",
+            '}',
+            '',
+            'move_plan_tier() {',
+            '    local key="$1"',
+            '    local tier="$2"',
+            '    # Listed to a file first so a failed read stops the script (set -e)',
+            '    plan_files "$key" > "$PLAN_LIST"',
+            '    while IFS= read -r -d \'\' src; do',
+            '        move_file "$src" "$tier"',
+            '    done < "$PLAN_LIST"',
+            '}',
+            '',
+        ])
+        tier_funcs = (
+            ("tier1", "T1", "Periphery (low risk)", "t1_periphery"),
+            ("tier2", "T2", "Shadows (medium risk)", "t2_shadow"),
+            ("tier3", "T3", "Ghosts (zero evidence)", "t3_ghost"),
+        )
+        for tier, short, label, key in tier_funcs:
+            lines.extend([
+                f'move_{tier}() {{',
+                f'    echo ">> Moving {short}: {label}..."',
+                f'    move_plan_tier "{key}" "{tier}"',
+                f'    echo "  {short} done."',
+                '}',
+                '',
+            ])
 
         # Main dispatch
         lines.extend([
+            'case "${1:-help}" in',
+            '    tier1|tier2|tier3|all) check_plan ;;',
+            'esac',
+            '',
             'case "${1:-help}" in',
             '    tier1) move_tier1 ;;',
             '    tier2) move_tier2 ;;',
@@ -355,13 +479,14 @@ class QuarantineEngine:
             '        ;;',
             'esac',
             '',
+            'flush_manifest',
             'echo ""',
             'echo "Manifest updated: $MANIFEST"',
             'echo "To undo: bash restore.sh"',
         ])
 
         with open(script_path, "w") as f:
-            f.write("\n".join(lines) + "\n")
+            f.writelines(line + "\n" for line in lines)
 
     def _write_restore_script(self, restore_path):
         """Generate the restore bash script."""
@@ -418,44 +543,125 @@ class QuarantineEngine:
             f.write("\n".join(lines) + "\n")
 
     def _in_engine_scope(self, path):
-        """Check if a path is within any engine scope."""
-        if self.engine_scopes == ["."]:
-            return True
-        return any(path == s or path.startswith(s + "/") for s in self.engine_scopes)
+        """Check if a path is within any engine scope.
 
-    def _matches_shadow(self, path):
-        """Check if a file matches shadow/legacy naming patterns."""
-        for pattern in SHADOW_PATTERNS:
-            if pattern.search(path):
+        Apart from a path that is itself a scope, the answer depends only on
+        the parent directory, so it is memoized per directory.
+        """
+        if self._all_scope:
+            return True
+        if path in self._scope_set:
+            return True
+        parent = path.rpartition("/")[0]
+        cached = self._scope_cache.get(parent)
+        if cached is None:
+            cached = self._scope_cache[parent] = bool(parent) and self._dir_in_scope(parent)
+        return cached
+
+    def _dir_in_scope(self, dir_path):
+        """Uncached scope test for a directory (scope itself or below it)."""
+        if self._scope_trie is None:
+            return dir_path in self._scope_set or dir_path.startswith(self._scope_prefixes)
+        # Many scopes: descend one path segment at a time, O(depth) per lookup
+        node = self._scope_trie
+        for seg in dir_path.split("/"):
+            node = node.get(seg)
+            if node is None:
+                return False
+            if _SCOPE_END in node:
                 return True
         return False
 
+    def _matches_shadow(self, path, lower=None):
+        """Check if a file matches shadow/legacy naming patterns.
+
+        `lower` is path.lower() (or its normalized form) when the caller has it.
+        """
+        p = lower if lower is not None else path.lower()
+        if p.endswith(SHADOW_SUFFIXES):
+            return True
+        return "_v" in p and SHADOW_VERSION_RE.search(p) is not None
+
     # --- Python-native move/restore (no bash scripts) ---
 
     def _ledger_path(self):
-        """Path to the transaction ledger in quarantine directory."""
+        """Path to the transaction ledger in quarantine directory.
+
+        NDJSON: a header line ({"version", "created"}) followed by one line
+        per move, so apply() appends instead of rewriting the whole file.
+        """
+        return self.quarantine_dir / ".rie_ledger.ndjson"
+
+    def _legacy_ledger_path(self):
+        """Single-document JSON ledger written by older versions."""
         return self.quarantine_dir / ".rie_ledger.json"
 
     def _load_ledger(self):
-        """Load or initialize the transaction ledger."""
+        """Load or initialize the transaction ledger.
+
+        Malformed lines (e.g. a torn last line from an interrupted append)
+        are skipped with a warning; the rest of the ledger still loads.
+        """
         lp = self._ledger_path()
         if lp.exists():
+            ledger = {"version": 1, "moves": [], "created": None}
             try:
                 with open(lp, "r") as f:
+                    for lineno, line in enumerate(f, 1):
+                        if not line.strip():
+                            continue
+                        try:
+                            record = json.loads(line)
+                            if not isinstance(record, dict):
+                                raise ValueError("not a ledger record")
+                        except ValueError:
+                            log.warning(f"Skipping malformed ledger line {lineno} in {lp}")
+                            continue
+                        if "src" in record:
+                            ledger["moves"].append(record)
+                        else:
+                            ledger.update(record)
+                return ledger
+            except IOError:
+                pass
+
+        legacy = self._legacy_ledger_path()
+        if legacy.exists():
+            try:
+                with open(legacy, "r") as f:
                     return json.load(f)
             except (json.JSONDecodeError, IOError):
                 pass
         return {"version": 1, "moves": [], "created": None}
 
+    def _ledger_torn(self):
+        """True if the NDJSON ledger does not end on a line boundary."""
+        try:
+            with open(self._ledger_path(), "rb") as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() == 0:
+                    return False
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) != b"\n"
+        except OSError:
+            return False
+
     def _save_ledger(self, ledger):
-        """Atomically write the transaction ledger."""
-        import shutil as _shutil
+        """Atomically rewrite the whole transaction ledger (one pass)."""
         lp = self._ledger_path()
         lp.parent.mkdir(parents=True, exist_ok=True)
         tmp = lp.with_suffix(".tmp")
         with open(tmp, "w") as f:
-            json.dump(ledger, f, indent=2)
-        _shutil.move(str(tmp), str(lp))
+            f.write(json.dumps({"version": ledger.get("version", 1),
+                                "created": ledger.get("created")}) + "\n")
+            for entry in ledger.get("moves", []):
+                f.write(json.dumps(entry) + "\n")
+        os.replace(tmp, lp)
+
+        # The NDJSON ledger now holds everything; drop the old format
+        legacy = self._legacy_ledger_path()
+        if legacy.exists():
+            legacy.unlink()
 
     def apply(self, plan, tiers=None, dry_run=False):
         """
@@ -470,7 +676,6 @@ class QuarantineEngine:
         Returns:
             dict with moved files, errors, and ledger state
         """
-        import shutil as _shutil
         from datetime import datetime as _dt
 
         if tiers is None:
@@ -507,60 +712,104 @@ class QuarantineEngine:
                 "files": [{"file": f, "tier": t} for f, t in files_to_move[:100]],
             }
 
-        # Load ledger
-        ledger = self._load_ledger()
-        if not ledger.get("created"):
-            try:
-                from datetime import timezone as _tz
-                ledger["created"] = _dt.now(_tz.utc).isoformat()
-            except ImportError:
-                ledger["created"] = _dt.utcnow().isoformat() + "Z"
-
-        moved = []
-        errors = []
-        skipped = 0
-
-        for file_path, tier in files_to_move:
+        # Start a new ledger (or migrate a legacy JSON one, or drop a torn
+        # last line) if needed; moves are then appended one line each
+        # through a single open handle
+        if (not self._ledger_path().exists() or self._legacy_ledger_path().exists()
+                or self._ledger_torn()):
+            ledger = self._load_ledger()
+            if not ledger.get("created"):
+                try:
+                    from datetime import timezone as _tz
+                    ledger["created"] = _dt.now(_tz.utc).isoformat()
+                except ImportError:
+                    ledger["created"] = _dt.utcnow().isoformat() + "Z"
+            self._save_ledger(ledger)
+
+        quarantine_dir = self.quarantine_dir
+        created_dirs = set()
+        ledger_lock = threading.Lock()
+
+        def move_one(item):
+            """Move one file and record it in the ledger.
+
+            Returns (file_path, ledger record | error | None).
+            """
+            file_path, tier = item
             src = self.repo_root / file_path
             dst = self.quarantine_dir / tier / file_path
 
             if not src.exists():
-                skipped += 1
-                continue
+                return file_path, None
 
             try:
                 # Check permissions
                 if not os.access(str(src), os.W_OK):
-                    errors.append({"file": file_path, "error": "Permission denied"})
-                    continue
+                    return file_path, {"error": "Permission denied"}
 
                 # Check for collision at destination
                 if dst.exists():
-                    errors.append({"file": file_path, "error": "Destination exists"})
-                    continue
-
-                # Create destination directory
-                dst.parent.mkdir(parents=True, exist_ok=True)
-
-                # Move
-                _shutil.move(str(src), str(dst))
-
-                # Record in ledger
-                ledger["moves"].append({
+                    return file_path, {"error": "Destination exists"}
+
+                # Create destination directory once per directory; ancestors
+                # of a created dir exist too (exist_ok: workers race here)
+                parent = dst.parent
+                if parent not in created_dirs:
+                    parent.mkdir(parents=True, exist_ok=True)
+                    while parent not in created_dirs and parent != quarantine_dir:
+                        created_dirs.add(parent)
+                        parent = parent.parent
+
+                # Move (quarantine dir is a sibling, usually the same filesystem)
+                _rename_or_move(str(src), str(dst))
+
+                # Record right away, so every finished move is in the ledger
+                # even if the run is interrupted before its result is read
+                record = {
                     "src": str(src),
                     "dst": str(dst),
                     "rel": file_path,
                     "tier": tier,
                     "timestamp": _dt.utcnow().isoformat() + "Z",
-                })
-
-                moved.append(file_path)
-
+                }
+                try:
+                    line = json.dumps(record) + "\n"
+                    with ledger_lock:
+                        ledger_fh.write(line)
+                        ledger_fh.flush()
+                except BaseException:
+                    # An unrecorded move could never be restored: put it back
+                    _rename_or_move(str(dst), str(src))
+                    raise
+                return file_path, record
             except Exception as e:
-                errors.append({"file": file_path, "error": str(e)})
+                return file_path, {"error": str(e)}
 
-        # Save ledger after all moves (atomic write)
-        self._save_ledger(ledger)
+        moved = []
+        errors = []
+        skipped = 0
+
+        # Moves are syscall-bound and release the GIL, so a thread pool
+        # overlaps them. Each worker appends its own ledger line (in
+        # completion order); results are collected here in plan order
+        workers = min(MAX_MOVE_WORKERS, len(files_to_move)) or 1
+        with open(self._ledger_path(), "a") as ledger_fh, \
+                ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(move_one, item) for item in files_to_move]
+            try:
+                for future in futures:
+                    file_path, result = future.result()
+                    if result is None:
+                        skipped += 1
+                    elif "error" in result:
+                        errors.append({"file": file_path, "error": result["error"]})
+                    else:
+                        moved.append(file_path)
+            except BaseException:
+                # Don't start queued moves; running ones finish and record themselves
+                for future in futures:
+                    future.cancel()
+                raise
 
         # Clean up empty directories left behind
         self._cleanup_empty_dirs()
@@ -585,21 +834,21 @@ class QuarantineEngine:
         Returns:
             dict with restored files and errors
         """
-        import shutil as _shutil
-
         ledger = self._load_ledger()
         moves = ledger.get("moves", [])
         if not moves:
             return {"restored": [], "error": "Ledger is empty -- nothing to restore"}
 
-        # Restore in reverse order (most recent first)
-        to_restore = moves[-count:] if count else moves
-        to_restore = list(reversed(to_restore))
+        # Restore in reverse order (most recent first), by ledger index
+        first = max(len(moves) - count, 0) if count else 0
+        to_restore = range(len(moves) - 1, first - 1, -1)
 
         restored = []
         errors = []
+        restored_idx = set()
 
-        for entry in to_restore:
+        for i in to_restore:
+            entry = moves[i]
             src_path = Path(entry["src"])
             dst_path = Path(entry["dst"])
 
@@ -609,14 +858,14 @@ class QuarantineEngine:
 
             try:
                 src_path.parent.mkdir(parents=True, exist_ok=True)
-                _shutil.move(str(dst_path), str(src_path))
+                _rename_or_move(str(dst_path), str(src_path))
                 restored.append(entry["rel"])
-                # Remove from ledger
-                if entry in ledger["moves"]:
-                    ledger["moves"].remove(entry)
+                restored_idx.add(i)
             except Exception as e:
                 errors.append({"file": entry["rel"], "error": str(e)})
 
+        # Drop restored entries and rewrite the ledger in one pass
+        ledger["moves"] = [m for i, m in enumerate(moves) if i not in restored_idx]
         self._save_ledger(ledger)
 
         return {
@@ -628,12 +877,32 @@ class QuarantineEngine:
 
     def _cleanup_empty_dirs(self):
         """Remove empty directories left behind after moves."""
-        import os as _os
-        for dirpath, dirnames, filenames in _os.walk(str(self.repo_root), topdown=False):
-            if not dirnames and not filenames:
-                try:
-                    dp = Path(dirpath)
-                    if dp != self.repo_root and ".git" not in dp.parts:
-                        dp.rmdir()
-                except OSError:
-                    pass
+        self._remove_empty_dirs(str(self.repo_root), is_root=True)
+
+    def _remove_empty_dirs(self, path, is_root=False):
+        """
+        Depth-first scandir walk that rmdirs directories left empty.
+        Returns True if `path` was removed. DirEntry type info comes from the
+        directory listing, so files are never stat()ed; CLEANUP_SKIP_DIRS
+        subtrees are not entered.
+        """
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError:
+            return False
+
+        empty = True
+        for entry in entries:
+            if entry.name in CLEANUP_SKIP_DIRS or not entry.is_dir(follow_symlinks=False):
+                empty = False  # Files, symlinks and skipped dirs keep this dir
+            elif not self._remove_empty_dirs(entry.path):
+                empty = False
+
+        if empty and not is_root:
+            try:
+                os.rmdir(path)
+                return True
+            except OSError:
+                pass
+        return False
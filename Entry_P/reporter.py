@@ -4,17 +4,97 @@ Generates the final structured report:
   - reports/usage_index.json (machine-readable)
   - reports/report_viewer.html (interactive browser viewer)
 """
+import gzip
+import io
 import json
+import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
+from policy_enforcer import violation_json_default
+
+try:
+    import orjson  # Optional C encoder for the report files
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard  # Optional; compressed report copies fall back to gzip
+except ImportError:
+    zstandard = None
+
+log = logging.getLogger("rie")
+
+# generated_at format: ISO 8601 UTC with a "Z" suffix, built in one call
+UTC_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+
+# Shared read-only stand-in for entrypoints missing from file_data
+_EMPTY = {}
+
+# usage_index.json contract version. 2.3.0 moved the evidence records to
+# the files.ndjson sidecar and stores repeated sections as {"$ref": ...}
+# aliases; 2.2.0 reports carry everything inline. Readers (clean.py, the
+# viewer) accept any of READABLE_SCHEMA_VERSIONS.
+REPORT_SCHEMA_VERSION = "2.3.0"
+READABLE_SCHEMA_VERSIONS = ("2.2.0", "2.3.0")
+
+# Top-level report keys that repeat another section. In memory they hold the
+# data itself; usage_index.json stores {"$ref": "<key>[/<subkey>]"} instead
+# (the viewer resolves these on load).
+REPORT_ALIASES = {
+    "policy_violations": ("layer_4_policy",),
+    "active_in_archive": ("layer_4_policy", "active_in_archive"),
+}
+
+# Per-file evidence records are written here, one JSON object per line,
+# and referenced from usage_index.json's layer_1_evidence
+EVIDENCE_FILES_NAME = "files.ndjson"
+
+# generate() encodes and writes reports here so callers continue meanwhile;
+# one worker keeps writes ordered. Threads start on first submit.
+_REPORT_WRITER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rie-report")
+
+
+def _dumps(obj) -> bytes:
+    """Compact UTF-8 JSON bytes, via orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=violation_json_default,
+                            option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False,
+                      default=violation_json_default).encode("utf-8")
+
+
+def _write_atomic(path, data):
+    """
+    Write bytes to a sibling .tmp file, fsync, and rename over `path`, so
+    readers never observe a truncated or half-written report.
+    """
+    tmp = f"{path}.tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
 
 
 class Reporter:
-    def __init__(self, repo_root: Path):
+    def __init__(self, repo_root: Path, compress: bool = False):
+        """
+        Args:
+            repo_root: Path to repository root
+            compress: also write a compressed copy of usage_index.json
+                      (.json.zst with zstandard installed, else .json.gz)
+        """
         self.repo_root = repo_root
+        self.compress = compress
         self.reports_dir = repo_root / "reports"
         self.reports_dir.mkdir(exist_ok=True)
+        self._pending = []  # Futures of background report writes
 
     def generate(
         self,
@@ -39,37 +119,66 @@ class Reporter:
         metadata = metadata or {}
         surface_data = surface_data or {}
 
-        active_count = sum(1 for f in file_data if f["status"] == "ACTIVE")
-        legacy_count = sum(1 for f in file_data if f["status"] == "LEGACY")
-        runtime_count = sum(1 for f in file_data if "runtime_trace" in f.get("evidence", []))
-
-        # Enrich classified entrypoints with domain/scope/surface from file_data
-        file_map = {f["file"]: f for f in file_data}
+        # Totals shared by "summary" and "scan_stats" are computed once:
+        # one pass over file_data for the status/evidence counts and file_map
+        total_files = len(file_data)
+        active_count = legacy_count = runtime_count = static_count = 0
+        file_map = {}
+        for f in file_data:
+            file_map[f["file"]] = f
+            status = f["status"]
+            if status == "ACTIVE":
+                active_count += 1
+            elif status == "LEGACY":
+                legacy_count += 1
+            evidence = f.get("evidence", ())
+            if "runtime_trace" in evidence:
+                runtime_count += 1
+            if "static_import" in evidence:
+                static_count += 1
+
+        # Enrich classified entrypoints with domain/scope/surface from file_data,
+        # collecting primary candidates in the same pass
+        primary_candidates = []
+        primary_append = primary_candidates.append
+        file_map_get = file_map.get
         for ep in classified_entrypoints:
-            fdata = file_map.get(ep["path"], {})
+            path = ep["path"]
+            fdata = file_map_get(path, _EMPTY)
             ep["domain"] = fdata.get("domain", "unknown")
-            ep["scope"] = ep["path"].split("/")[0] if "/" in ep["path"] else "root"
-            ep["surface_id"] = fdata.get("surface_id", ep["scope"])
-
-        primary_candidates = [ep for ep in classified_entrypoints if ep.get("eligible_for_primary")]
+            # Top-level directory: one forward scan, no split list
+            head, sep, _ = path.partition("/")
+            scope = ep["scope"] = head if sep else "root"
+            ep["surface_id"] = fdata.get("surface_id", scope)
+            if ep.get("eligible_for_primary"):
+                primary_append(ep)
+
+        clusters = phase_two_data.get("clusters") or {}
+
+        # Non-empty adjacency entries; the graph engine produces sets, which
+        # JSON needs as lists, but lists (e.g. from a loaded report) pass as-is
+        graph_out = {}
+        for node, neighbors in (phase_two_data.get("graph") or {}).items():
+            if neighbors:
+                graph_out[node] = neighbors if type(neighbors) is list else list(neighbors)
         coverage_summary = triangulation_data.get("coverage_summary", {})
         coverage_ratio = coverage_summary.get("coverage_ratio", 0)
 
         report = {
-            "schema_version": "2.2.0",
+            "schema_version": REPORT_SCHEMA_VERSION,
             "metadata": {
                 **metadata,
-                "generated_at": datetime.utcnow().isoformat() + "Z",
+                "generated_at": datetime.utcnow().strftime(UTC_TIMESTAMP_FORMAT),
                 "repo": str(self.repo_root),
                 "tool": "Repository Integrity Engine",
                 "version": "2.2",
             },
             "summary": {
-                "total_files": len(file_data),
+                "total_files": total_files,
                 "active_files": active_count,
                 "legacy_files": legacy_count,
                 "runtime_traced": runtime_count,
-                "static_imported": sum(1 for f in file_data if "static_import" in f.get("evidence", [])),
+                "static_imported": static_count,
                 "text_referenced": len(text_refs),
             },
             "layer_1_evidence": {
@@ -77,13 +186,16 @@ class Reporter:
             },
             "layer_2_structure": {
                 "graph_summary": {
-                    "total_nodes": phase_two_data.get("clusters", {}).get("total_nodes", 0),
-                    "total_edges": phase_two_data.get("clusters", {}).get("total_edges", 0),
-                    "roots": phase_two_data.get("clusters", {}).get("roots", [])[:20],
-                    "leaves_count": len(phase_two_data.get("clusters", {}).get("leaves", [])),
+                    "total_nodes": clusters.get("total_nodes", 0),
+                    "total_edges": clusters.get("total_edges", 0),
+                    "roots": list(clusters.get("roots") or ())[:20],
+                    "leaves_count": len(clusters.get("leaves") or ()),
                 },
-                # Full adjacency list -- consumed by clean.py for quarantine/prune
-                "graph": {k: sorted(v) for k, v in phase_two_data.get("graph", {}).items() if v},
+                # Full adjacency list -- consumed by clean.py for quarantine/prune,
+                # which loads each neighbor list back into a set, so order is moot
+                "graph": graph_out,
+                # Files using exec/eval/dynamic imports (RiskAnalyzer.get_summary)
+                "risk_summary": phase_two_data.get("risk", {}),
                 "cartography": {
                     "folders": cartography_data.get("folders", {}),
                     "domains": cartography_data.get("domains", []),
@@ -102,36 +214,107 @@ class Reporter:
                 "classified": classified_entrypoints,
                 "primary_candidates": primary_candidates,
             },
+            # Same object as layer_4_policy; written as a $ref (REPORT_ALIASES)
             "policy_violations": policy_data,
             "cartography_data": {
                 "domains": cartography_data.get("domains", []),
             },
             "scan_stats": {
-                "files_scanned": len(file_data),
+                "files_scanned": total_files,
                 "entrypoints_detected": len(classified_entrypoints),
                 "runtime_traced": runtime_count,
-                "static_imports": sum(1 for f in file_data if "static_import" in f.get("evidence", [])),
+                "static_imports": static_count,
             },
             "engine_coverage": coverage_ratio,
             "active_in_archive": policy_data.get("active_in_archive", []),
             "surfaces": surface_data,
         }
 
+        # Encoding + writing runs in the background; call flush() to wait
+        self._pending.append(_REPORT_WRITER.submit(self._write_files, report))
+        return report
+
+    def flush(self):
+        """Wait for background report writes, re-raising any write error."""
+        pending, self._pending = self._pending, []
+        for future in pending:
+            log.info(future.result())
+
+    def write_report(self, report: dict):
+        """Write usage_index.json and the HTML viewer for an assembled report."""
+        self.flush()  # Keep this write ordered after background ones
+        log.info(self._write_files(report))
+
+    def _write_files(self, report):
+        """Write the report files; returns the summary message to log."""
         json_path = self.reports_dir / "usage_index.json"
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(report, f, indent=2, default=str)
 
-        self._generate_html_viewer()
+        # Evidence records go to the NDJSON sidecar; the index only references
+        # them. The in-memory report keeps the full list for callers.
+        evidence = report.get("layer_1_evidence") or {}
+        evidence_line = ""
+        if "files" in evidence:
+            files = evidence["files"]
+            buf = io.BytesIO()
+            for f in files:
+                buf.write(_dumps(f))
+                buf.write(b"\n")
+            with buf.getbuffer() as view:
+                # Written before the index that references it
+                _write_atomic(self.reports_dir / EVIDENCE_FILES_NAME, view)
+            report = {**report, "layer_1_evidence": {
+                "files_ref": EVIDENCE_FILES_NAME,
+                "count": len(files),
+            }}
+            evidence_line = f"   - {EVIDENCE_FILES_NAME} ({len(files)} records)\n"
+
+        # Sections that are the very object they repeat become $ref aliases
+        aliases = {}
+        for key, path in REPORT_ALIASES.items():
+            target = report
+            for part in path:
+                target = target.get(part) if isinstance(target, dict) else None
+            value = report.get(key)
+            if value is not None and value is target:
+                aliases[key] = {"$ref": "/".join(path)}
+        if aliases:
+            report = {**report, **aliases}
+
+        # Encode once and write once; json.dump would issue a write() per chunk.
+        # Compact output: the viewer pretty-prints what it displays.
+        data = _dumps(report)
+        _write_atomic(json_path, data)
+
+        # Compress the already-encoded buffer in one shot
+        compressed_line = ""
+        if self.compress:
+            if zstandard is not None:
+                packed_path = json_path.with_suffix(".json.zst")
+                packed = zstandard.ZstdCompressor(level=3).compress(data)
+            else:
+                packed_path = json_path.with_suffix(".json.gz")
+                packed = gzip.compress(data, compresslevel=6)
+            packed_path.write_bytes(packed)
+            compressed_line = f"   - {packed_path.name} ({len(packed)} bytes)\n"
 
-        print(f"\n\u2705 Reports written to: {self.reports_dir}")
-        print(f"   - {json_path.name} ({os.path.getsize(json_path)} bytes)")
-        print(f"   - report_viewer.html")
+        self._generate_html_viewer()
 
-        return report
+        return (f"\n\u2705 Reports written to: {self.reports_dir}\n"
+                f"   - {json_path.name} ({len(data)} bytes)\n"
+                f"{evidence_line}"
+                f"{compressed_line}"
+                f"   - report_viewer.html")
 
     def _generate_html_viewer(self):
+        """Write the viewer unless an identical copy is already on disk."""
         html_path = self.reports_dir / "report_viewer.html"
-        html_path.write_text(VIEWER_HTML, encoding="utf-8")
+        try:
+            if (html_path.stat().st_size == len(VIEWER_HTML_BYTES)
+                    and html_path.read_bytes() == VIEWER_HTML_BYTES):
+                return
+        except OSError:
+            pass
+        html_path.write_bytes(VIEWER_HTML_BYTES)
 
 
 
@@ -553,10 +736,19 @@ VIEWER_HTML = """<!DOCTYPE html>
                 if (!res.ok) throw new Error(`HTTP ${res.status}`);
                 reportData = await res.json();
 
+                // Resolve top-level aliases stored as {"$ref": "<key>[/<subkey>]"}
+                for (const [key, value] of Object.entries(reportData)) {
+                    if (value && typeof value === 'object' && typeof value.$ref === 'string') {
+                        const target = value.$ref.split('/').reduce(
+                            (obj, part) => (obj == null ? undefined : obj[part]), reportData);
+                        reportData[key] = target == null ? {} : target;
+                    }
+                }
+
                 // Schema version check
-                const expectedSchema = '2.2.0';
-                if (reportData.schema_version && reportData.schema_version !== expectedSchema) {
-                    console.warn(`Report schema ${reportData.schema_version} may not match viewer v${expectedSchema}`);
+                const supportedSchemas = __RIE_SCHEMAS__;
+                if (!supportedSchemas.includes(reportData.schema_version)) {
+                    console.warn(`Report schema ${reportData.schema_version} is not one this viewer reads (${supportedSchemas.join(', ')})`);
                 }
                 
                 // Extract data
@@ -690,8 +882,11 @@ VIEWER_HTML = """<!DOCTYPE html>
             const select = document.getElementById('jsonSection');
             const block = document.getElementById('jsonBlock');
 
-            function render() {
+            async function render() {
                 const key = select.value;
+                if (key === '__full__' || key === 'layer_1_evidence') {
+                    await loadEvidenceFiles();
+                }
                 let data;
                 if (key === '__full__') {
                     data = reportData;
@@ -705,6 +900,25 @@ VIEWER_HTML = """<!DOCTYPE html>
             render();
         }
 
+        // Per-file evidence lives in a separate NDJSON file (files_ref);
+        // only fetched when a view actually shows it
+        async function loadEvidenceFiles() {
+            const evidence = reportData.layer_1_evidence;
+            if (!evidence || !evidence.files_ref || evidence.files) return;
+            try {
+                const res = await fetch(evidence.files_ref);
+                if (!res.ok) throw new Error(`HTTP ${res.status}`);
+                const text = await res.text();
+                const files = [];
+                for (const line of text.split('\\n')) {
+                    if (line) files.push(JSON.parse(line));
+                }
+                evidence.files = files;
+            } catch (err) {
+                console.warn(`Could not load ${evidence.files_ref}: ${err.message}`);
+            }
+        }
+
         function syntaxHighlight(json) {
             json = json.replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;');
             return json.replace(
@@ -1035,3 +1249,10 @@ VIEWER_HTML = """<!DOCTYPE html>
     </script>
 </body>
 </html>"""
+
+# The template encoded once at import, with the readable schema versions
+# filled in (it is pure ASCII; a stray non-ASCII
+# character fails here rather than at write time). Written as-is by
+# _generate_html_viewer, which skips the write when the file already matches.
+VIEWER_HTML_BYTES = VIEWER_HTML.replace(
+    "__RIE_SCHEMAS__", json.dumps(list(READABLE_SCHEMA_VERSIONS))).encode("ascii")
@@ -6,64 +6,292 @@ Detects patterns that could cause false negatives in static analysis:
   - File-based loading (config-driven module loading)
   - subprocess calls to Python scripts
 """
+import hashlib
+import json
+import logging
+import mmap
+import os
 import re
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from engine_version import engine_fingerprint
+
+try:
+    import hyperscan  # Optional SIMD multi-pattern matcher; falls back to re
+except ImportError:
+    hyperscan = None
+
+log = logging.getLogger("rie")
+
 IGNORE_DIRS = {"__pycache__", ".git", "node_modules", ".venv", "venv", "reports"}
 
-# Patterns indicating dynamic loading
+# Patterns indicating dynamic loading. All ASCII, so they run on raw file
+# bytes with no UTF-8 decode.
 DYNAMIC_PATTERNS = [
-    (re.compile(r'\b__import__\s*\('), "dynamic_import", "Uses __import__()"),
-    (re.compile(r'\bimportlib\.import_module\s*\('), "dynamic_import", "Uses importlib.import_module()"),
-    (re.compile(r'\brunpy\.run_module\s*\('), "dynamic_import", "Uses runpy.run_module()"),
-    (re.compile(r'\bexec\s*\('), "code_execution", "Uses exec()"),
-    (re.compile(r'\beval\s*\('), "code_execution", "Uses eval()"),
-    (re.compile(r'\bsubprocess\.\w+\('), "subprocess", "Uses subprocess"),
-    (re.compile(r'\bos\.system\s*\('), "subprocess", "Uses os.system()"),
-    (re.compile(r'\bos\.popen\s*\('), "subprocess", "Uses os.popen()"),
-    (re.compile(r'\bload_source\s*\('), "dynamic_load", "Uses load_source()"),
-    (re.compile(r'\bspec_from_file_location\s*\('), "dynamic_load", "Uses spec_from_file_location()"),
+    (re.compile(rb'\b__import__\s*\('), "dynamic_import", "Uses __import__()"),
+    (re.compile(rb'\bimportlib\.import_module\s*\('), "dynamic_import", "Uses importlib.import_module()"),
+    (re.compile(rb'\brunpy\.run_module\s*\('), "dynamic_import", "Uses runpy.run_module()"),
+    (re.compile(rb'\bexec\s*\('), "code_execution", "Uses exec()"),
+    (re.compile(rb'\beval\s*\('), "code_execution", "Uses eval()"),
+    (re.compile(rb'\bsubprocess\.\w+\('), "subprocess", "Uses subprocess"),
+    (re.compile(rb'\bos\.system\s*\('), "subprocess", "Uses os.system()"),
+    (re.compile(rb'\bos\.popen\s*\('), "subprocess", "Uses os.popen()"),
+    (re.compile(rb'\bload_source\s*\('), "dynamic_load", "Uses load_source()"),
+    (re.compile(rb'\bspec_from_file_location\s*\('), "dynamic_load", "Uses spec_from_file_location()"),
 ]
 
+# Literal substrings: every DYNAMIC_PATTERNS match contains one of these.
+# Files containing none of them skip the pattern scan entirely.
+RISK_KEYWORDS = (
+    b"__import__", b"importlib", b"runpy", b"exec", b"eval", b"subprocess",
+    b"os.system", b"os.popen", b"load_source", b"spec_from_file_location",
+)
+
+# All patterns in one scan. Every pattern is rb'\b' + a literal first
+# character, so the combined regex leads with a character-class lookahead
+# that lets the engine skip ahead cheaply, then tests the word boundary once.
+# The alternatives sit in a zero-width lookahead, so matches never consume
+# text: a pattern can still match inside another one's span (exec( within
+# subprocess.exec(), exactly as with separate passes. No two patterns can
+# start at the same offset.
+_FIRST_CHARS = bytes(sorted({pattern.pattern[2] for pattern, _, _ in DYNAMIC_PATTERNS}))
+COMBINED_PATTERN = re.compile(
+    b"(?=[" + re.escape(_FIRST_CHARS) + b"])\\b(?=" + b"|".join(
+        b"(?P<g%d>%s)" % (i, pattern.pattern[2:]) for i, (pattern, _, _) in enumerate(DYNAMIC_PATTERNS)
+    ) + b")"
+)
+# Group g<i> is capturing group i + 1 (the patterns have no groups of their
+# own), so a match's pattern index is m.lastindex - 1
+_combined_finditer = COMBINED_PATTERN.finditer
+
+# Hyperscan database over the same patterns (ids index DYNAMIC_PATTERNS),
+# compiled on first use in each process
+_HS_DB = None
+
+
+def _hyperscan_hits(data: bytes):
+    """All (pattern index, start offset) matches in `data`, in start order."""
+    global _HS_DB
+    if _HS_DB is None:
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[pattern.pattern for pattern, _, _ in DYNAMIC_PATTERNS],
+            ids=list(range(len(DYNAMIC_PATTERNS))),
+            elements=len(DYNAMIC_PATTERNS),
+            flags=[hyperscan.HS_FLAG_SOM_LEFTMOST] * len(DYNAMIC_PATTERNS),
+        )
+        _HS_DB = db
+
+    hits = set()
+
+    def on_match(idx, start, end, flags, context):
+        hits.add((start, idx))
+
+    _HS_DB.scan(data, match_event_handler=on_match)
+    return [(idx, start) for start, idx in sorted(hits)]
+
+
+def _regex_hits(source):
+    """All (pattern index, start offset) matches in `source`, in start order."""
+    return [(m.lastindex - 1, m.start()) for m in _combined_finditer(source)]
+
+
+# Cache file under RiskAnalyzer's cache_dir. Entries are only valid for the
+# pattern set and engine build that produced them.
+RISK_CACHE_NAME = "risk_cache.json"
+_PATTERN_SIGNATURE = hashlib.sha256("\n".join(
+    f"{pattern.pattern.decode()}\t{category}\t{description}"
+    for pattern, category, description in DYNAMIC_PATTERNS
+).encode()).hexdigest()
+
+# Below this many files the process pool costs more to start than it saves
+RISK_PARALLEL_MIN = 200
+
+# Files at least this large are scanned through a read-only mmap (re path)
+# instead of being read into memory
+RISK_MMAP_MIN = 1 << 20
+
+
+def _scan_file(path: str):
+    """
+    Scan one file for risky patterns (module-level so worker processes can
+    pickle it). Returns a list of risk records, empty when nothing matched.
+    """
+    mapped = None
+    try:
+        with open(path, "rb") as f:
+            if hyperscan is None and os.fstat(f.fileno()).st_size >= RISK_MMAP_MIN:
+                source = mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                source = f.read()
+    except (OSError, ValueError):
+        return []
+    try:
+        return _file_risks(source)
+    finally:
+        if mapped is not None:
+            mapped.close()
+
+
+class _LineIndex:
+    """Newline offsets of one source (bytes or mmap), for repeated line lookups."""
+
+    def __init__(self, source):
+        find = source.find
+        self.newlines = newlines = []
+        pos = find(b"\n")
+        while pos >= 0:
+            newlines.append(pos)
+            pos = find(b"\n", pos + 1)
+
+    def of(self, position: int) -> int:
+        """1-based line of `position`."""
+        return bisect_right(self.newlines, position) + 1
+
+
+def _file_risks(source):
+    """Risk records for one file's raw bytes (bytes or mmap)."""
+    # Substring prefilter (find, not `in`: mmap's `in` does not match
+    # subsequences); most files have no keyword at all
+    find = source.find
+    if not any(find(keyword) >= 0 for keyword in RISK_KEYWORDS):
+        return []
+
+    if hyperscan is not None:
+        hits = _hyperscan_hits(source)
+    else:
+        hits = _regex_hits(source)
+
+    # Per pattern, count every match and keep the first 5 offsets
+    counts = {}
+    starts = {}
+    for idx, start in hits:
+        if idx in counts:
+            counts[idx] += 1
+            if len(starts[idx]) < 5:
+                starts[idx].append(start)
+        else:
+            counts[idx] = 1
+            starts[idx] = [start]
+
+    if not counts:
+        return []
+
+    # Newline offsets once per file; each line number is then a bisect
+    line_of = _LineIndex(source).of
+    file_risks = []
+    for idx in sorted(counts):
+        _, category, description = DYNAMIC_PATTERNS[idx]
+        file_risks.append({
+            "category": category,
+            "description": description,
+            "count": counts[idx],
+            "lines": [line_of(start) for start in starts[idx]],
+        })
+    return file_risks
+
 
 class RiskAnalyzer:
-    def __init__(self, repo_root: Path):
+    def __init__(self, repo_root: Path, cache_dir: Path = None):
+        """
+        Args:
+            repo_root: repository root
+            cache_dir: directory for the per-file scan cache, keyed by
+                       mtime + size (None disables caching)
+        """
         self.repo_root = repo_root
+        self.cache_dir = cache_dir
+        self.cache_stats = {"hits": 0, "misses": 0}
 
     def analyze(self) -> dict:
         """
         Scan all Python files for risky patterns.
         Returns dict of file_rel -> list of risk records.
+
+        Large repos are scanned across a process pool; the regex sweep is
+        CPU-bound and does not release the GIL. With a cache_dir, files whose
+        mtime and size are unchanged since the last run are not re-read.
         """
-        risks = {}
-        for p in self.repo_root.rglob("*.py"):
-            if any(part in IGNORE_DIRS for part in p.parts):
-                continue
-            try:
-                source = p.read_text(encoding="utf-8", errors="ignore")
-            except Exception:
-                continue
-
-            file_risks = []
-            for pattern, category, description in DYNAMIC_PATTERNS:
-                matches = list(pattern.finditer(source))
-                if matches:
-                    file_risks.append({
-                        "category": category,
-                        "description": description,
-                        "count": len(matches),
-                        "lines": [self._line_number(source, m.start()) for m in matches[:5]],
-                    })
+        paths = [p for p in self.repo_root.rglob("*.py")
+                 if not any(part in IGNORE_DIRS for part in p.parts)]
+        rels = [str(p.relative_to(self.repo_root)) for p in paths]
+
+        # Reuse cached results for unchanged files; scan the rest
+        cached = self._load_cache()
+        fresh = {}  # Cache contents for this run: rel -> [mtime_ns, size, risks]
+        results = [None] * len(paths)
+        stats = [None] * len(paths)
+        to_scan = []
+        for i, (p, rel) in enumerate(zip(paths, rels)):
+            if self.cache_dir is not None:
+                try:
+                    st = p.stat()
+                except OSError:
+                    continue
+                stats[i] = (st.st_mtime_ns, st.st_size)
+                hit = cached.get(rel)
+                if hit is not None and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+                    results[i] = hit[2]
+                    fresh[rel] = hit
+                    continue
+            to_scan.append(i)
+
+        scan_paths = [str(paths[i]) for i in to_scan]
+        if len(scan_paths) >= RISK_PARALLEL_MIN and (os.cpu_count() or 1) > 1:
+            with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+                scanned = list(ex.map(_scan_file, scan_paths, chunksize=64))
+        else:
+            scanned = [_scan_file(path) for path in scan_paths]
 
+        for i, file_risks in zip(to_scan, scanned):
+            results[i] = file_risks
+            if stats[i] is not None:
+                fresh[rels[i]] = [*stats[i], file_risks]
+
+        if self.cache_dir is not None:
+            self.cache_stats["hits"] += len(paths) - len(to_scan)
+            self.cache_stats["misses"] += len(to_scan)
+            if to_scan or len(fresh) != len(cached):
+                self._save_cache(fresh)
+
+        risks = {}
+        for rel, file_risks in zip(rels, results):
             if file_risks:
-                rel = str(p.relative_to(self.repo_root))
                 risks[rel] = file_risks
 
         return risks
 
-    @staticmethod
-    def _line_number(source: str, position: int) -> int:
-        return source[:position].count("\n") + 1
+    def _cache_path(self) -> Path:
+        return Path(self.cache_dir) / RISK_CACHE_NAME
+
+    def _load_cache(self) -> dict:
+        """rel -> [mtime_ns, size, risks] from the last run, or {}."""
+        if self.cache_dir is None:
+            return {}
+        try:
+            with open(self._cache_path(), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("patterns") != _PATTERN_SIGNATURE or data.get("engine") != engine_fingerprint():
+                return {}  # Patterns or engine changed since the cache was written
+            return data["files"]
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            return {}
+
+    def _save_cache(self, files: dict):
+        """Atomically replace the cache file."""
+        cache_path = self._cache_path()
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"patterns": _PATTERN_SIGNATURE, "engine": engine_fingerprint(),
+                           "files": files}, f,
+                          separators=(",", ":"))
+            os.replace(tmp, cache_path)
+        except OSError as e:
+            log.debug(f"  Risk cache not written: {e}")
 
     def get_summary(self) -> dict:
         """Get a summary of risk patterns across the repo."""
@@ -10,24 +10,400 @@ Modes:
 The auto/import-only approach:
   1. Read the target file
   2. Parse with AST, extract only import/from-import statements  
-  3. Build a mini-script that does ONLY those imports (with import hook active)
+  3. Run ONLY those imports in the tracer child (with import hook active)
   4. The hook captures what files get loaded -> dependency chain discovered
   
 This works regardless of __init__.py, folder names with spaces, or missing package structure.
+
+All entrypoints of a run are traced by one tracer child, which boots once and
+forks a fresh copy of itself per entrypoint so every trace starts clean.
 """
 import ast
 import json
+import logging
 import os
+import queue
+import select
+import signal
 import subprocess
 import sys
 import tempfile
-import textwrap
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    import orjson  # Optional C codec for requests and traces
+except ImportError:
+    orjson = None
+
+log = logging.getLogger("rie")
+
+# Where fork is available one tracer child boots once and forks a fresh copy of
+# itself per entrypoint; elsewhere every entrypoint gets its own interpreter.
+CAN_FORK = hasattr(os, "fork")
+
+# Extra time the parent allows a forking child beyond an entrypoint's timeout
+WORKER_GRACE = 5
+
+# Entrypoints traced at once, each through its own tracer child. Timeouts are
+# wall-clock, so this stays at the CPU count: oversubscribing the CPUs would
+# turn slow-but-finishing traces into timeouts.
+MAX_TRACE_WORKERS = os.cpu_count() or 1
+
+# Tracer child. Each request is one JSON line on stdin; each reply is a
+# "<status> <size>" header line followed by <size> bytes of trace JSON.
+_TRACER_SCRIPT = r'''
+import builtins, json, os, select, signal, site, sys, sysconfig, time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _lib_prefixes():
+    """Directories of the stdlib and installed packages, each ending in a separator."""
+    paths = sysconfig.get_paths()
+    dirs = [paths.get(key) for key in ("stdlib", "platstdlib", "purelib", "platlib")]
+    try:
+        dirs.extend(site.getsitepackages())
+    except AttributeError:
+        pass
+    prefixes = []
+    for d in dirs:
+        if d:
+            d = os.path.join(os.path.abspath(d), "")
+            if d not in prefixes:
+                prefixes.append(d)
+    return prefixes
+
+
+_LIB_PREFIXES = _lib_prefixes()
+
+
+def _dumps(obj):
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            pass  # e.g. surrogate-escaped paths; json escapes them
+    return json.dumps(obj).encode()
+
+
+def _loads(data):
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            pass
+    return json.loads(data)
+
+
+def _trace(req, out_fd):
+    """Trace one request in this process, write its JSON to out_fd, and exit."""
+    repo = req["repo"]
+    loaded = set()
+    edges = []
+    blocked = []
+    dumped = []
+    # name -> (module, in-repo absolute file or None), so repeat imports of a
+    # module skip the __file__/abspath/prefix work
+    seen = {}
+    caller_in_repo = {}
+    # Modules under these never count as in-repo, so skip abspath for them;
+    # a library dir that overlaps the repo is not skipped
+    skip = tuple(p for p in _LIB_PREFIXES if not p.startswith(repo) and not repo.startswith(p))
+    real_import = builtins.__import__
+
+    def hooked_import(name, globals=None, locals=None, fromlist=(), level=0):
+        mod = real_import(name, globals, locals, fromlist, level)
+        try:
+            m = sys.modules.get(name)
+            hit = seen.get(name)
+            if hit is not None and hit[0] is m:
+                abs_f = hit[1]
+            else:
+                f = getattr(m, '__file__', None)
+                abs_f = os.path.abspath(f) if f and not f.startswith(skip) else None
+                if abs_f is not None and not abs_f.startswith(repo):
+                    abs_f = None
+                if m is not None:
+                    seen[name] = (m, abs_f)
+            if abs_f is not None:
+                loaded.add(abs_f)
+                # The importing frame is only needed for in-repo modules
+                caller = None
+                try:
+                    frame = sys._getframe(1)
+                    if frame and hasattr(frame, 'f_code'):
+                        caller = frame.f_code.co_filename
+                except ValueError:
+                    pass
+                if caller:
+                    in_repo = caller_in_repo.get(caller)
+                    if in_repo is None:
+                        in_repo = caller_in_repo[caller] = caller.startswith(repo)
+                    if in_repo:
+                        edges.append((caller, abs_f))
+        except Exception:
+            pass
+        return mod
+
+    builtins.__import__ = hooked_import
+
+    try:
+        def audit_hook(event, args):
+            if event in ("subprocess.Popen", "os.system", "os.exec", "os.spawn", "socket.connect"):
+                blocked.append({"event": event, "details": str(args)})
+                raise PermissionError("Blocked")
+        sys.addaudithook(audit_hook)
+    except Exception:
+        pass
+
+    def dump():
+        if dumped:
+            return
+        dumped.append(True)
+        try:
+            data = _dumps({"files": sorted(list(loaded)), "edges": edges, "blocked": blocked})
+            while data:
+                data = data[os.write(out_fd, data):]
+        except Exception:
+            pass
+
+    # Safety net: self-terminate before the timeout
+    try:
+        def alarm(signum, frame):
+            dump()
+            os._exit(0)
+        signal.signal(signal.SIGALRM, alarm)
+        signal.alarm(req["alarm"])
+    except (AttributeError, ValueError):
+        pass
+
+    sys.path[:0] = [p for p in req["path"] if p not in sys.path]
+
+    rc = 0
+    namespace = {"__name__": "__main__"}
+    try:
+        if req["imports"] is not None:
+            # One failed import must not stop the rest
+            for module, fromlist, level in req["imports"]:
+                try:
+                    hooked_import(module, namespace, namespace, tuple(fromlist) if fromlist else None, level)
+                except Exception:
+                    pass
+        else:
+            # Full execution mode: run the entrypoint itself
+            try:
+                with open(req["ep"]) as f:
+                    source = f.read()
+                exec(source, namespace)
+            except SystemExit:
+                pass
+            except Exception:
+                pass
+    except SystemExit as e:
+        rc = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except BaseException:
+        rc = 1
+    dump()
+    os._exit(rc)
+
+
+def _collect(pid, fd, timeout):
+    """Read a forked trace until it exits, killing it at the timeout."""
+    deadline = time.monotonic() + timeout
+    chunks = []
+    status = None
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+            os.kill(pid, signal.SIGKILL)
+            status = "timeout"
+            break
+        chunk = os.read(fd, 65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    _, st = os.waitpid(pid, 0)
+    if status is None:
+        status = "ok" if os.WIFEXITED(st) and os.WEXITSTATUS(st) == 0 else "error"
+    return status, b"".join(chunks)
+
+
+def _serve():
+    # Keep the real stdout for replies; traced code writes to stderr instead
+    out_fd = os.dup(1)
+    os.dup2(2, 1)
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for line in sys.stdin.buffer:
+        req = _loads(line)
+        r, w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            try:
+                os.close(r)
+                os.close(out_fd)
+                os.dup2(devnull, 0)
+                _trace(req, w)
+            finally:
+                os._exit(1)
+        os.close(w)
+        status, data = _collect(pid, r, req["timeout"])
+        os.close(r)
+        reply = ("%s %d\n" % (status, len(data))).encode() + data
+        while reply:
+            reply = reply[os.write(out_fd, reply):]
+
+
+if __name__ == "__main__":
+    # Done here rather than via Popen(cwd=, start_new_session=) so the parent
+    # can launch this script with posix_spawn
+    os.chdir(sys.argv[-1])
+    if sys.argv[1] == "--once":
+        req = _loads(sys.stdin.buffer.readline())
+        out_fd = os.dup(1)
+        os.dup2(2, 1)
+        _trace(req, out_fd)
+    else:
+        os.setsid()
+        _serve()
+'''
+
+
+def _json_dumps(obj) -> bytes:
+    """JSON bytes, via orjson when it is installed and can encode obj."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            pass  # e.g. surrogate-escaped paths; json escapes them
+    return json.dumps(obj).encode()
+
+
+def _json_loads(data):
+    """Decode JSON bytes, via orjson when it is installed and accepts them."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            pass
+    return json.loads(data)
+
+
+class _TraceSession:
+    """Runs traces one at a time through a tracer child of its own."""
+
+    def __init__(self, script: str, env: dict, cwd: Path):
+        self.script = script
+        self.env = env
+        self.cwd = str(cwd)
+        self.proc = None
+        self._buf = bytearray()
+
+    def trace(self, request: dict, timeout: int) -> tuple:
+        """Trace one request. Returns (status, raw trace JSON bytes)."""
+        line = _json_dumps(request) + b"\n"
+        if not CAN_FORK:
+            return self._trace_once(line, timeout)
+
+        if self.proc is None:
+            self.proc = subprocess.Popen(
+                [sys.executable, self.script, self.cwd],
+                env=self.env,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                bufsize=0,
+                close_fds=False,
+            )
+            self._buf = bytearray()
+        try:
+            self.proc.stdin.write(line)
+            return self._reply(time.monotonic() + timeout + WORKER_GRACE)
+        except TimeoutError:
+            # The child itself is stuck; replace it on the next request
+            self._stop()
+            return "timeout", b""
+        except Exception as e:
+            self._stop()
+            return f"error:{type(e).__name__}", b""
+
+    def _reply(self, deadline: float) -> tuple:
+        buf = self._buf
+        while b"\n" not in buf:
+            self._fill(deadline)
+        end = buf.index(b"\n")
+        status, size = buf[:end].decode().split()
+        size = int(size)
+        del buf[:end + 1]
+        while len(buf) < size:
+            self._fill(deadline)
+        data = bytes(buf[:size])
+        del buf[:size]
+        return status, data
+
+    def _fill(self, deadline: float):
+        fd = self.proc.stdout.fileno()
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+            raise TimeoutError
+        chunk = os.read(fd, 65536)
+        if not chunk:
+            raise EOFError("tracer child exited")
+        self._buf += chunk
+
+    def _trace_once(self, line: bytes, timeout: int) -> tuple:
+        try:
+            result = subprocess.run(
+                [sys.executable, self.script, "--once", self.cwd],
+                input=line,
+                timeout=timeout,
+                capture_output=True,
+                env=self.env,
+                close_fds=False,
+            )
+            return ("ok" if result.returncode == 0 else "error"), result.stdout
+        except subprocess.TimeoutExpired as e:
+            return "timeout", e.stdout or b""
+        except Exception as e:
+            return f"error:{type(e).__name__}", b""
+
+    def _stop(self):
+        if self.proc is not None:
+            # The child and any trace it forked share a process group
+            if self.proc.poll() is None:
+                try:
+                    os.killpg(self.proc.pid, signal.SIGKILL)
+                except OSError:
+                    pass
+                self.proc.wait()
+            for stream in (self.proc.stdin, self.proc.stdout):
+                try:
+                    stream.close()
+                except OSError:
+                    pass
+            self.proc = None
+
+    def close(self):
+        if self.proc is not None:
+            try:
+                self.proc.stdin.close()
+                self.proc.wait(timeout=WORKER_GRACE)
+            except Exception:
+                pass
+        self._stop()
+
 
 class RuntimeTracer:
     def __init__(self, repo_root: Path):
         self.repo_root = repo_root
+        # path -> (mtime_ns, size, import code); reused across run_trace calls
+        self._import_cache = {}
+        # Private temp dir holding the tracer script, created on first trace
+        self._script_dir = None
 
     def run_trace(
         self,
@@ -49,9 +425,10 @@ class RuntimeTracer:
         entrypoint_hints = entrypoint_hints or {}
         total = len(entrypoints)
 
-        print(f"[TRACE] Tracing {total} entrypoints (mode: {trace_mode})...")
+        log.info(f"[TRACE] Tracing {total} entrypoints (mode: {trace_mode})...")
 
-        for idx, ep in enumerate(entrypoints, 1):
+        jobs = []
+        for ep in entrypoints:
             rel = str(ep.relative_to(self.repo_root))
             hint = entrypoint_hints.get(rel, "")
 
@@ -61,51 +438,73 @@ class RuntimeTracer:
                 mode = "full"
             else:
                 mode = "import-only"
+            jobs.append((ep, rel, timeout, mode))
+
+        # Each worker thread borrows a session (and so a tracer child) for
+        # one trace at a time; results are reported in entrypoint order
+        script = self._tracer_script()
+        env = self._child_env(safe)
+        workers = min(MAX_TRACE_WORKERS, total) or 1
+        sessions = queue.Queue()
+        for _ in range(workers):
+            sessions.put(_TraceSession(script, env, self.repo_root))
+
+        def trace_job(job):
+            session = sessions.get()
+            try:
+                return self._trace_single(session, job[0], timeout=job[2], mode=job[3])
+            finally:
+                sessions.put(session)
 
-            print(f"  [{idx}/{total}] {rel}", end="", flush=True)
-
-            trace_result = self._trace_single(ep, safe=safe, timeout=timeout, mode=mode)
-
-            # Mark based on simulation results
-            status = trace_result["status"]
-            blocked = trace_result.get("blocked", [])
-            if blocked:
-                status = "blocked"
-            
-            n_files = len(trace_result["files"])
-            if n_files > 0:
-                print(f" -> {n_files} files", end="")
-            
-            if status == "timeout":
-                print(f" [TIMEOUT]", end="")
-                timeouts.append(rel)
-            elif status == "blocked":
-                print(f" [BLOCKED]", end="")
-            elif status == "ok":
-                if n_files == 0:
-                    print(f" -> 0 in-repo", end="")
-            else:
-                print(f" [{status}]", end="")
-            print()
-
-            traced_entries.append({
-                "path": rel,
-                "status": status,
-                "files_found": n_files,
-                "mode": mode,
-                "timeout": timeout,
-                "blocked_events": blocked,
-            })
-
-            for f in trace_result["files"]:
-                fp = Path(f)
-                if fp.exists():
-                    runtime_files.add(fp)
-
-            for src, tgt in trace_result.get("edges", []):
-                relations.append((src, tgt))
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for idx, ((ep, rel, timeout, mode), trace_result) in enumerate(
+                        zip(jobs, pool.map(trace_job, jobs)), 1):
+                    line = f"  [{idx}/{total}] {rel}"
+
+                    # Mark based on simulation results
+                    status = trace_result["status"]
+                    blocked = trace_result.get("blocked", [])
+                    if blocked:
+                        status = "blocked"
+
+                    n_files = len(trace_result["files"])
+                    if n_files > 0:
+                        line += f" -> {n_files} files"
+
+                    if status == "timeout":
+                        line += " [TIMEOUT]"
+                        timeouts.append(rel)
+                    elif status == "blocked":
+                        line += " [BLOCKED]"
+                    elif status == "ok":
+                        if n_files == 0:
+                            line += " -> 0 in-repo"
+                    else:
+                        line += f" [{status}]"
+                    log.info(line)
+
+                    traced_entries.append({
+                        "path": rel,
+                        "status": status,
+                        "files_found": n_files,
+                        "mode": mode,
+                        "timeout": timeout,
+                        "blocked_events": blocked,
+                    })
+
+                    for f in trace_result["files"]:
+                        fp = Path(f)
+                        if fp.exists():
+                            runtime_files.add(fp)
+
+                    for src, tgt in trace_result.get("edges", []):
+                        relations.append((src, tgt))
+        finally:
+            while not sessions.empty():
+                sessions.get().close()
 
-        print(f"[TRACE] Done. {len(runtime_files)} unique files, {len(timeouts)} timeouts.")
+        log.info(f"[TRACE] Done. {len(runtime_files)} unique files, {len(timeouts)} timeouts.")
 
         trace_meta = {
             "trace_mode": trace_mode,
@@ -117,201 +516,127 @@ class RuntimeTracer:
 
         return runtime_files, relations, trace_meta
 
-    def _extract_imports(self, filepath: Path) -> str:
+    def _extract_imports(self, filepath: Path) -> list:
         """
-        Parse a Python file and extract only its import statements as executable code.
-        Returns a string of just the import lines, safe to exec.
+        Parse a Python file and extract only its top-level import statements.
+        Returns a list of [module, fromlist, level] entries in __import__ argument
+        order (fromlist is None for plain imports), shared between callers.
+        Results are memoized per file until its mtime or size changes.
         """
         try:
-            source = filepath.read_text(encoding="utf-8", errors="ignore")
-            tree = ast.parse(source, filename=str(filepath))
+            st = filepath.stat()
+        except OSError:
+            return self._parse_imports(filepath)
+
+        key = str(filepath)
+        cached = self._import_cache.get(key)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        code = self._parse_imports(filepath)
+        self._import_cache[key] = (st.st_mtime_ns, st.st_size, code)
+        return code
+
+    def _parse_imports(self, filepath: Path) -> list:
+        # Parse the raw bytes: the parser decodes them itself (honouring any
+        # coding cookie), so no intermediate str copy of the file is built
+        try:
+            source = filepath.read_bytes()
+            try:
+                tree = ast.parse(source, filename=str(filepath))
+            except SyntaxError:
+                try:
+                    source.decode("utf-8")
+                except UnicodeDecodeError:
+                    # Undecodable bytes: parse what does decode, as before
+                    tree = ast.parse(source.decode("utf-8", errors="ignore"), filename=str(filepath))
+                else:
+                    raise
         except (SyntaxError, ValueError, UnicodeDecodeError):
-            return ""
+            return []
 
-        import_lines = []
+        imports = []
         for node in ast.iter_child_nodes(tree):
             # Only grab top-level imports (not inside functions/classes)
             if isinstance(node, ast.Import):
                 for alias in node.names:
-                    import_lines.append(f"import {alias.name}")
+                    imports.append([alias.name, None, 0])
             elif isinstance(node, ast.ImportFrom):
                 module = node.module or ""
-                names = ", ".join(alias.name for alias in node.names)
-                level = "." * (node.level or 0)
-                if module:
-                    import_lines.append(f"from {level}{module} import {names}")
-                elif level:
-                    import_lines.append(f"from {level} import {names}")
-
-        return "\n".join(import_lines)
-
-    def _trace_single(self, entrypoint: Path, safe: bool = True, timeout: int = 10, mode: str = "import-only") -> dict:
-        """Trace a single entrypoint by running it in a subprocess with import hooking."""
-        trace_out = tempfile.mktemp(suffix=".json", prefix="rie_trace_")
-
-        # The import hook that captures loaded files
-        hook_setup = textwrap.dedent(f"""\
-        import atexit, json, os, sys
-
-        _loaded = set()
-        _edges = []
-        _blocked = []
-        _repo = {repr(str(self.repo_root))}
-        _ep = {repr(str(entrypoint))}
-        _trace_out = {repr(trace_out)}
-
-        _real_import = __builtins__.__import__ if hasattr(__builtins__, '__import__') else __import__
-
-        def _hooked_import(name, globals=None, locals=None, fromlist=(), level=0):
-            caller = None
-            try:
-                frame = sys._getframe(1)
-                if frame and hasattr(frame, 'f_code'):
-                    caller = frame.f_code.co_filename
-            except ValueError:
-                pass
-
-            mod = _real_import(name, globals, locals, fromlist, level)
-            try:
-                m = sys.modules.get(name)
-                f = getattr(m, '__file__', None)
-                if f:
-                    abs_f = os.path.abspath(f)
-                    if abs_f.startswith(_repo):
-                        _loaded.add(abs_f)
-                        if caller and caller.startswith(_repo):
-                            _edges.append((caller, abs_f))
-            except Exception:
-                pass
-            return mod
-
-        try:
-            import builtins
-            builtins.__import__ = _hooked_import
-        except Exception:
-            pass
-
-        try:
-            def _audit_hook(event, args):
-                if event in ("subprocess.Popen", "os.system", "os.exec", "os.spawn", "socket.connect"):
-                    _blocked.append({{"event": event, "details": str(args)}})
-                    raise PermissionError("Blocked")
-            sys.addaudithook(_audit_hook)
-        except Exception:
-            pass
-
-        def _dump():
-            try:
-                os.makedirs(os.path.dirname(_trace_out), exist_ok=True)
-                with open(_trace_out, 'w') as f:
-                    json.dump({{"files": sorted(list(_loaded)), "edges": _edges, "blocked": _blocked}}, f)
-            except Exception:
-                pass
-
-        atexit.register(_dump)
-        os.environ['__RIE_TRACING__'] = '1'
-
-        # Safety net: self-terminate before parent's timeout
-        try:
-            import signal
-            def _alarm(signum, frame):
-                _dump()
-                os._exit(0)
-            signal.signal(signal.SIGALRM, _alarm)
-            signal.alarm({max(timeout - 2, 3)})
-        except (AttributeError, ValueError):
-            pass
-
-        # Add the entrypoint's directory AND all intermediate parents to sys.path
-        _ep_dir = os.path.dirname(_ep)
-        _path_parts = os.path.relpath(_ep_dir, _repo).split(os.sep)
-        _current = _repo
-        for _part in _path_parts:
-            _current = os.path.join(_current, _part)
-            if _current not in sys.path:
-                sys.path.insert(0, _current)
-        if _ep_dir and _ep_dir not in sys.path:
-            sys.path.insert(0, _ep_dir)
-        """)
-
+                level = node.level or 0
+                if module or level:
+                    imports.append([module, [alias.name for alias in node.names], level])
+
+        return imports
+
+
+    def _tracer_script(self) -> str:
+        """Path of the tracer script, written once per tracer and reused by every run."""
+        if self._script_dir is None:
+            # TemporaryDirectory removes itself when the tracer is collected
+            self._script_dir = tempfile.TemporaryDirectory(prefix="rie_")
+            with open(os.path.join(self._script_dir.name, "tracer.py"), "w") as f:
+                f.write(_TRACER_SCRIPT)
+        return os.path.join(self._script_dir.name, "tracer.py")
+
+    def _child_env(self, safe: bool) -> dict:
+        """Environment for tracer children."""
+        env = os.environ.copy()
+        env["__RIE_TRACING__"] = "1"
+        # No empty entry: children chdir themselves, so "" would not mean repo_root
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, (str(self.repo_root), env.get("PYTHONPATH"))))
+
+        if safe:
+            env["DISPLAY"] = ""
+            env["WAYLAND_DISPLAY"] = ""
+            env["SDL_VIDEODRIVER"] = "dummy"
+            env["QT_QPA_PLATFORM"] = "offscreen"
+            env["MPLBACKEND"] = "Agg"
+        return env
+
+    def _trace_single(self, session: _TraceSession, entrypoint: Path, timeout: int = 10, mode: str = "import-only") -> dict:
+        """Trace a single entrypoint in the session's tracer child with import hooking."""
         if mode == "import-only":
-            # Extract just the import statements from the file via AST
-            import_code = self._extract_imports(entrypoint)
-            if import_code:
-                # Wrap each import in try/except so one failure doesn't stop the rest
-                safe_imports = []
-                for line in import_code.split("\n"):
-                    if line.strip():
-                        safe_imports.append(f"try:\n    {line}\nexcept Exception:\n    pass")
-                hook_code = hook_setup + "\n" + "\n".join(safe_imports) + "\n"
-            else:
-                hook_code = hook_setup
+            # Extract just the import statements from the file via AST;
+            # the child runs them in a loop
+            imports = self._extract_imports(entrypoint)
         else:
-            # Full execution mode
-            hook_code = hook_setup + textwrap.dedent(f"""
+            # Full execution mode: the child runs the file itself
+            imports = None
+
+        # The entrypoint's directory AND all intermediate parents go on the
+        # child's sys.path, innermost first
+        ep_dir = os.path.dirname(str(entrypoint))
+        path = []
+        current = str(self.repo_root)
+        for part in os.path.relpath(ep_dir, current).split(os.sep):
+            current = os.path.join(current, part)
+            path.insert(0, current)
+        if ep_dir and ep_dir not in path:
+            path.insert(0, ep_dir)
+
+        request = {
+            "repo": str(self.repo_root),
+            "path": path,
+            "imports": imports,
+            "ep": str(entrypoint),
+            "timeout": timeout,
+            "alarm": max(timeout - 2, 3),
+        }
+        status, output = session.trace(request, timeout)
+
+        # Parse the trace the child reported
+        files = []
+        edges = []
+        blocked = []
+        if output:
             try:
-                exec(open({repr(str(entrypoint))}).read())
-            except SystemExit:
-                pass
+                data = _json_loads(output)
+                files = data.get("files", [])
+                edges = data.get("edges", [])
+                blocked = data.get("blocked", [])
+                if status == "timeout" and files:
+                    status = "partial"
             except Exception:
                 pass
-            """)
-
-        tracer_file = tempfile.mktemp(suffix=".py", prefix="rie_tracer_")
-        try:
-            with open(tracer_file, "w") as f:
-                f.write(hook_code)
-
-            env = os.environ.copy()
-            env["__RIE_TRACING__"] = "1"
-            env["PYTHONPATH"] = str(self.repo_root) + os.pathsep + env.get("PYTHONPATH", "")
 
-            if safe:
-                env["DISPLAY"] = ""
-                env["WAYLAND_DISPLAY"] = ""
-                env["SDL_VIDEODRIVER"] = "dummy"
-                env["QT_QPA_PLATFORM"] = "offscreen"
-                env["MPLBACKEND"] = "Agg"
-
-            try:
-                result = subprocess.run(
-                    [sys.executable, tracer_file],
-                    cwd=str(self.repo_root),
-                    timeout=timeout,
-                    capture_output=True,
-                    env=env,
-                )
-                status = "ok" if result.returncode == 0 else "error"
-            except subprocess.TimeoutExpired:
-                status = "timeout"
-                try:
-                    subprocess.run(["pkill", "-f", tracer_file], capture_output=True, timeout=2)
-                except Exception:
-                    pass
-            except Exception as e:
-                status = f"error:{type(e).__name__}"
-
-            # Read trace output
-            files = []
-            edges = []
-            blocked = []
-            if os.path.exists(trace_out):
-                try:
-                    with open(trace_out) as f:
-                        data = json.load(f)
-                    files = data.get("files", [])
-                    edges = data.get("edges", [])
-                    blocked = data.get("blocked", [])
-                    if status == "timeout" and files:
-                        status = "partial"
-                except Exception:
-                    pass
-
-            return {"status": status, "files": files, "edges": edges, "blocked": blocked}
-
-        finally:
-            for tmp in (tracer_file, trace_out):
-                try:
-                    os.unlink(tmp)
-                except OSError:
-                    pass
+        return {"status": status, "files": files, "edges": edges, "blocked": blocked}
@@ -18,12 +18,13 @@ if os.environ.get("__RIE_TRACING__"):
     sys.exit(0)
 
 from pathlib import Path
-from main import build_arg_parser, run_scan
+from main import build_arg_parser, configure_logging, run_scan
 
 
 def main():
     parser = build_arg_parser(include_surgery=False)
     args = parser.parse_args()
+    configure_logging(args)
 
     repo_root = Path(args.repo).resolve()
     if not repo_root.exists():
@@ -10,6 +10,33 @@ separate entrypoint rankings. Cross-surface edges are tracked explicitly.
 from pathlib import Path
 from collections import defaultdict, Counter
 
+# Marks a trie node where a surface root ends; maps to that surface's id
+_ROOT_END = object()
+
+
+def _build_root_trie(roots) -> dict:
+    """Segment trie over (sid, root) pairs. The first sid given for a root wins."""
+    trie = {}
+    for sid, root in roots:
+        node = trie
+        for seg in root.split("/"):
+            node = node.setdefault(seg, {})
+        node.setdefault(_ROOT_END, sid)
+    return trie
+
+
+def _longest_root(trie: dict, parts: list):
+    """Walk path segments down the trie; return the sid of the deepest root hit."""
+    best = None
+    node = trie
+    for seg in parts:
+        node = node.get(seg)
+        if node is None:
+            break
+        if _ROOT_END in node:
+            best = node[_ROOT_END]
+    return best
+
 
 class ScopeResolver:
     def __init__(self, repo_root: Path, file_data: list, graph: dict,
@@ -20,6 +47,13 @@ class ScopeResolver:
         self.target_config = engine_target_config or {}
         self._surface_cache = {}
         self._detected_roots = None  # Populated by detect_surfaces()
+        self._root_trie = None       # Segment trie over _detected_roots
+        self._config_trie = None     # Segment trie over surface_config roots
+        self._surfaces_memo = None   # (file_data, detect_surfaces() result)
+        self._files_by_surface = None  # (file_data, {surface_id: [file records]})
+        self.path_to_surface = {}    # Populated by tag_files(): file -> surface_id
+        self._edge_cache = None      # (graph, path_to_surface, result) from classify_edges()
+        self._cross_allowed_cache = {}
 
         # Surface config from engine_target.yml
         self.surface_config = self.target_config.get("surfaces", {})
@@ -39,21 +73,29 @@ class ScopeResolver:
             },
             "unassigned_count": 5,
         }
+
+        The result is memoized until self.file_data is replaced.
         """
+        memo = self._surfaces_memo
+        if memo is not None and memo[0] is self.file_data:
+            return memo[1]
+
         if self.surface_config:
             result = self._detect_from_config()
             # Cache roots for resolve_surface
-            self._detected_roots = sorted(
-                [(sid, sdata["root"].rstrip("/")) for sid, sdata in result["surfaces"].items()],
-                key=lambda x: -len(x[1])
-            )
+            self._cache_roots(result["surfaces"])
+            self._surfaces_memo = (self.file_data, result)
             return result
 
         folder_stats = defaultdict(lambda: {"files": 0, "py": 0, "runtime": 0, "active": 0})
+        # Per top folder, stats for each sub-directory (for sub-surface splits below)
+        sub_stats_by_top = defaultdict(
+            lambda: defaultdict(lambda: {"files": 0, "py": 0, "active": 0, "runtime": 0}))
         root_files = 0
 
         for entry in self.file_data:
-            parts = entry["file"].split("/")
+            path = entry["file"]
+            parts = path.split("/", 2)
             if len(parts) <= 1:
                 root_files += 1
                 continue
@@ -63,13 +105,22 @@ class ScopeResolver:
                                 "__pycache__", "node_modules", "_quarantine"):
                 continue
 
-            folder_stats[top]["files"] += 1
-            if entry["file"].endswith(".py"):
-                folder_stats[top]["py"] += 1
-            if entry.get("status") == "ACTIVE":
-                folder_stats[top]["active"] += 1
-            if "runtime_trace" in entry.get("evidence", []):
-                folder_stats[top]["runtime"] += 1
+            is_py = path.endswith(".py")
+            is_active = entry.get("status") == "ACTIVE"
+            is_runtime = "runtime_trace" in entry.get("evidence", [])
+
+            stats = folder_stats[top]
+            stats["files"] += 1
+            stats["py"] += is_py
+            stats["active"] += is_active
+            stats["runtime"] += is_runtime
+
+            if len(parts) == 3:
+                sub_stats = sub_stats_by_top[top][parts[1]]
+                sub_stats["files"] += 1
+                sub_stats["py"] += is_py
+                sub_stats["active"] += is_active
+                sub_stats["runtime"] += is_runtime
 
         # A surface must have at least 3 Python files
         surfaces = {}
@@ -93,22 +144,7 @@ class ScopeResolver:
                 if sdata["py_count"] < 20:
                     continue
 
-                sub_stats = defaultdict(lambda: {"files": 0, "py": 0, "active": 0, "runtime": 0})
-                for entry in self.file_data:
-                    if not entry["file"].startswith(folder + "/"):
-                        continue
-                    rest = entry["file"][len(folder) + 1:]
-                    sub_parts = rest.split("/")
-                    if len(sub_parts) <= 1:
-                        continue
-                    sub = sub_parts[0]
-                    sub_stats[sub]["files"] += 1
-                    if entry["file"].endswith(".py"):
-                        sub_stats[sub]["py"] += 1
-                    if entry.get("status") == "ACTIVE":
-                        sub_stats[sub]["active"] += 1
-                    if "runtime_trace" in entry.get("evidence", []):
-                        sub_stats[sub]["runtime"] += 1
+                sub_stats = sub_stats_by_top[folder]
 
                 # Need at least 2 significant sub-folders to justify splitting
                 significant_subs = {k: v for k, v in sub_stats.items() if v["py"] >= 3}
@@ -129,13 +165,19 @@ class ScopeResolver:
 
         result = {"surfaces": surfaces, "unassigned_count": root_files}
 
-        # Cache roots for resolve_surface (longest first for prefix matching)
+        # Cache roots for resolve_surface
+        self._cache_roots(surfaces)
+
+        self._surfaces_memo = (self.file_data, result)
+        return result
+
+    def _cache_roots(self, surfaces: dict):
+        """Store detected roots (longest first) and their segment trie."""
         self._detected_roots = sorted(
             [(sid, sdata["root"].rstrip("/")) for sid, sdata in surfaces.items()],
             key=lambda x: -len(x[1])
         )
-
-        return result
+        self._root_trie = _build_root_trie(self._detected_roots)
 
     def _ensure_detected(self):
         """Ensure detect_surfaces has been called and roots are cached."""
@@ -186,13 +228,12 @@ class ScopeResolver:
 
         # Check explicit config first -- longest prefix wins
         if self.surface_config:
-            best_sid = None
-            best_len = 0
-            for sid, conf in self.surface_config.items():
-                root = conf.get("root", sid + "/").rstrip("/")
-                if (file_path.startswith(root + "/") or file_path == root) and len(root) > best_len:
-                    best_sid = sid
-                    best_len = len(root)
+            if self._config_trie is None:
+                roots = ((sid, conf.get("root", sid + "/").rstrip("/"))
+                         for sid, conf in self.surface_config.items())
+                # An empty root never wins the longest-prefix test
+                self._config_trie = _build_root_trie((sid, root) for sid, root in roots if root)
+            best_sid = _longest_root(self._config_trie, parts)
             if best_sid:
                 self._surface_cache[file_path] = best_sid
                 return best_sid
@@ -200,10 +241,10 @@ class ScopeResolver:
         # Check auto-detected roots (includes auto-split sub-surfaces)
         self._ensure_detected()
         if self._detected_roots:
-            for sid, root in self._detected_roots:  # Already sorted longest-first
-                if file_path.startswith(root + "/") or file_path == root:
-                    self._surface_cache[file_path] = sid
-                    return sid
+            sid = _longest_root(self._root_trie, parts)
+            if sid is not None:
+                self._surface_cache[file_path] = sid
+                return sid
 
         # Fallback: top-level folder
         top = parts[0]
@@ -214,28 +255,43 @@ class ScopeResolver:
         """
         Add surface_id and surface_root to every file record.
         Mutates in place AND returns for chaining.
+
+        Also rebuilds self.path_to_surface, a flat file -> surface_id dict
+        that edge classification and PolicyEnforcer use as an O(1) lookup.
+        An unchanged map keeps its identity so classify_edges() can reuse
+        its last result.
         """
         surfaces = self.detect_surfaces()
         surface_map = surfaces["surfaces"]
+        path_to_surface = {}
 
         for entry in file_data:
             sid = self.resolve_surface(entry["file"])
+            path_to_surface[entry["file"]] = sid
             entry["surface_id"] = sid
             if sid in surface_map:
                 entry["surface_root"] = surface_map[sid]["root"]
             else:
                 entry["surface_root"] = sid + "/"
 
+        if path_to_surface != self.path_to_surface:
+            self.path_to_surface = path_to_surface
         return file_data
 
     # ----------------------------------------------------------------
     # Cross-surface edge analysis
     # ----------------------------------------------------------------
 
-    def classify_edges(self, graph: dict) -> dict:
+    def classify_edges(self, graph: dict, path_to_surface: dict = None) -> dict:
         """
         Classify all edges as intra-surface or cross-surface.
 
+        Args:
+            graph: adjacency list from GraphEngine
+            path_to_surface: precomputed file -> surface_id map (defaults to
+                             the one built by tag_files). Paths missing from
+                             it fall back to resolve_surface().
+
         Returns: {
             "intra_count": int,
             "cross_count": int,
@@ -243,14 +299,26 @@ class ScopeResolver:
             "cross_by_pair": {("godotsim", "godotengain"): [(src, dst), ...]},
         }
         """
+        if path_to_surface is None:
+            path_to_surface = self.path_to_surface
+
+        # Reuse the last result when called again on the same graph and
+        # surface map (tag_files() only replaces the map when it changes).
+        cached = self._edge_cache
+        if cached and cached[0] is graph and cached[1] is path_to_surface:
+            return cached[2]
+
+        surface_of = path_to_surface.get
+        resolve = self.resolve_surface
+
         intra_count = 0
         cross = []
         cross_by_pair = defaultdict(list)
 
         for src, neighbors in graph.items():
-            src_surface = self.resolve_surface(src)
+            src_surface = surface_of(src) or resolve(src)
             for dst in neighbors:
-                dst_surface = self.resolve_surface(dst)
+                dst_surface = surface_of(dst) or resolve(dst)
                 if src_surface == dst_surface:
                     intra_count += 1
                 else:
@@ -258,21 +326,31 @@ class ScopeResolver:
                     pair = (src_surface, dst_surface)
                     cross_by_pair[pair].append((src, dst))
 
-        return {
+        result = {
             "intra_count": intra_count,
             "cross_count": len(cross),
             "cross": cross,
             "cross_by_pair": dict(cross_by_pair),
         }
+        self._edge_cache = (graph, path_to_surface, result)
+        return result
 
     def is_cross_allowed(self, src_surface: str, dst_surface: str) -> bool:
         """Check if cross-surface edge is allowed by config."""
+        key = (src_surface, dst_surface)
+        if key in self._cross_allowed_cache:
+            return self._cross_allowed_cache[key]
+
+        allowed = False
         for rule in self.cross_allow:
             if rule.get("from") == src_surface and rule.get("to") == dst_surface:
-                return True
+                allowed = True
+                break
             if rule.get("from") == dst_surface and rule.get("to") == src_surface:
-                return True
-        return False
+                allowed = True
+                break
+        self._cross_allowed_cache[key] = allowed
+        return allowed
 
     # ----------------------------------------------------------------
     # Scope inference (backward compat)
@@ -334,10 +412,21 @@ class ScopeResolver:
     # Per-surface queries
     # ----------------------------------------------------------------
 
+    def _surface_buckets(self) -> dict:
+        """Group self.file_data by surface_id in one pass. Memoized per file_data."""
+        cached = self._files_by_surface
+        if cached is not None and cached[0] is self.file_data:
+            return cached[1]
+        self._ensure_detected()
+        buckets = defaultdict(list)
+        for e in self.file_data:
+            buckets[self.resolve_surface(e["file"])].append(e)
+        self._files_by_surface = (self.file_data, buckets)
+        return buckets
+
     def get_surface_graph(self, graph: dict, surface_id: str) -> dict:
         """Return subgraph containing only files from a specific surface."""
-        surface_files = {e["file"] for e in self.file_data
-                         if self.resolve_surface(e["file"]) == surface_id}
+        surface_files = {e["file"] for e in self._surface_buckets().get(surface_id, ())}
         subgraph = {}
         for node, neighbors in graph.items():
             if node in surface_files:
@@ -346,8 +435,7 @@ class ScopeResolver:
 
     def get_surface_files(self, surface_id: str) -> list:
         """Return file records for a specific surface."""
-        return [e for e in self.file_data
-                if self.resolve_surface(e["file"]) == surface_id]
+        return list(self._surface_buckets().get(surface_id, ()))
 
     def get_surface_metrics(self, graph: dict) -> dict:
         """
@@ -364,20 +452,27 @@ class ScopeResolver:
         surfaces = self.detect_surfaces()["surfaces"]
         edge_info = self.classify_edges(graph)
         cross_edges = edge_info["cross"]
+        buckets = self._surface_buckets()
+
+        # Internal edges for every surface in one pass over the graph
+        sid_of = {e["file"]: sid for sid, files in buckets.items() for e in files}
+        internal = Counter()
+        for node, neighbors in graph.items():
+            sid = sid_of.get(node)
+            if sid is not None:
+                internal[sid] += len({n for n in neighbors if sid_of.get(n) == sid})
+
+        cross_out_counts = Counter(ss for _, _, ss, _ in cross_edges)
+        cross_in_counts = Counter(ds for _, _, _, ds in cross_edges)
 
         metrics = {}
         for sid, sdata in surfaces.items():
-            s_files = self.get_surface_files(sid)
+            s_files = buckets.get(sid, ())
             active = sum(1 for f in s_files if f.get("status") == "ACTIVE")
             runtime = sum(1 for f in s_files if "runtime_trace" in f.get("evidence", []))
-
-            # Internal edges
-            s_graph = self.get_surface_graph(graph, sid)
-            internal_edges = sum(len(v) for v in s_graph.values())
-
-            # Cross edges
-            cross_out = sum(1 for _, _, ss, _ in cross_edges if ss == sid)
-            cross_in = sum(1 for _, _, _, ds in cross_edges if ds == sid)
+            internal_edges = internal[sid]
+            cross_out = cross_out_counts[sid]
+            cross_in = cross_in_counts[sid]
 
             total = len(s_files) or 1
             coverage = active / total
@@ -4,24 +4,113 @@ Parses all Python files to find import statements and build an import graph.
 Returns the set of files that are imported by other files in the repo.
 """
 import ast
+import json
+import logging
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-IGNORE_DIRS = {"__pycache__", ".git", "node_modules", ".venv", "venv", "reports", ".tox", ".mypy_cache"}
+log = logging.getLogger("rie")
+
+IGNORE_DIRS = frozenset({"__pycache__", ".git", "node_modules", ".venv", "venv", "reports", ".tox", ".mypy_cache"})
+
+# Per-file import cache (raw import specs, resolved fresh every run so module
+# map changes are picked up). Bump the version when the spec format changes.
+STATIC_CACHE_NAME = "static_cache.json"
+STATIC_CACHE_VERSION = 1
+
+# Fields holding nested statement lists (compound statements, except
+# handlers, match cases)
+_BODY_FIELDS = ("body", "orelse", "finalbody", "handlers", "cases")
+
+# Below this many files to parse the process pool costs more to start than
+# it saves
+STATIC_PARALLEL_MIN = 50
+
+
+def _file_imports(path: str) -> list:
+    """
+    Import specs of one file as [level, module] pairs: level 0 for absolute
+    imports and __import__("name") calls, the dot count for relative
+    imports. Empty when the file does not parse. Module-level so worker
+    processes can pickle it.
+    """
+    try:
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            source = f.read()
+        tree = ast.parse(source, filename=path)
+    except (SyntaxError, ValueError):
+        return []
+
+    # Import statements can only appear in statement bodies, so walk
+    # statements alone (including function and class bodies) rather
+    # than every expression node
+    specs = []
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                specs.append([0, alias.name])
+        elif isinstance(node, ast.ImportFrom):
+            specs.append([node.level, node.module or ""])
+        else:
+            for field in _BODY_FIELDS:
+                body = getattr(node, field, None)
+                if body:
+                    stack.extend(body)
+
+    # __import__("name") calls can sit in any expression; only files
+    # that mention it pay for the full walk
+    if "__import__" in source:
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "__import__":
+                if node.args and isinstance(node.args[0], ast.Constant) and isinstance(node.args[0].value, str):
+                    specs.append([0, node.args[0].value])
+    return specs
 
 
 class StaticAnalyzer:
-    def __init__(self, repo_root: Path):
+    def __init__(self, repo_root: Path, cache_dir: Path = None):
+        """
+        Args:
+            repo_root: repository root
+            cache_dir: directory for the per-file import cache, keyed by
+                       mtime + size (None disables caching)
+        """
         self.repo_root = repo_root
+        self.cache_dir = cache_dir
+        self.cache_stats = {"hits": 0, "misses": 0}
         self._module_map = {}  # module_name -> Path
         self._edges = []       # (importer_path, imported_path)
         self._build_module_map()
 
     def _py_files(self):
-        for p in self.repo_root.rglob("*.py"):
-            if any(part in IGNORE_DIRS for part in p.parts):
+        """
+        Yield every .py file under the repo, pruning IGNORE_DIRS subtrees
+        without entering them. Same order as rglob: a directory's files,
+        then its subdirectories depth-first, in listing order; symlinked
+        directories are not followed.
+        """
+        stack = [str(self.repo_root)]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    entries = list(it)
+            except OSError:
                 continue
-            yield p
+            subdirs = []
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    if entry.name not in IGNORE_DIRS:
+                        subdirs.append(entry.path)
+                elif entry.name.endswith(".py"):
+                    yield Path(entry.path)
+            stack.extend(reversed(subdirs))
 
     def _build_module_map(self):
         """Build mapping from dotted module names to file paths."""
@@ -73,46 +162,102 @@ class StaticAnalyzer:
         Analyze all Python files for imports.
         Returns the set of Paths that are statically imported by other files.
         Also populates self._edges as (importer, imported) tuples.
+
+        With a cache_dir, files whose mtime and size are unchanged since the
+        last run are not re-parsed; their cached import specs are resolved
+        against the current module map.
         """
         imported_files = set()
         self._edges = []
+        cached = self._load_cache()
+        fresh = {}  # Cache contents for this run: rel -> [mtime_ns, size, specs]
 
-        for p in sorted(self._py_files()):
-            try:
-                source = p.read_text(encoding="utf-8", errors="ignore")
-                tree = ast.parse(source, filename=str(p))
-            except (SyntaxError, ValueError):
-                continue
+        paths = sorted(self._py_files())
+        rels = [str(p.relative_to(self.repo_root)) for p in paths]
+        all_specs = [None] * len(paths)
+        stats = [None] * len(paths)
+        to_parse = []
+        for i, (p, rel) in enumerate(zip(paths, rels)):
+            if self.cache_dir is not None:
+                try:
+                    st = p.stat()
+                except OSError:
+                    st = None
+                if st is not None:
+                    stats[i] = (st.st_mtime_ns, st.st_size)
+                    hit = cached.get(rel)
+                    if hit is not None and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+                        all_specs[i] = hit[2]
+                        fresh[rel] = hit
+                        continue
+            to_parse.append(i)
+
+        # Parsing is CPU-bound and holds the GIL, so large batches go to a
+        # process pool; resolution stays here with the module map
+        parse_paths = [str(paths[i]) for i in to_parse]
+        workers = os.cpu_count() or 1
+        if len(parse_paths) >= STATIC_PARALLEL_MIN and workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                parsed = list(ex.map(_file_imports, parse_paths,
+                                     chunksize=max(1, len(parse_paths) // (workers * 4))))
+        else:
+            parsed = [_file_imports(path) for path in parse_paths]
 
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    for alias in node.names:
-                        target = self._resolve_import(alias.name, p)
-                        if target and target != p:
-                            imported_files.add(target)
-                            self._edges.append((p, target))
-                elif isinstance(node, ast.ImportFrom):
-                    module_name = node.module or ""
-                    # Handle relative imports (level > 0)
-                    if node.level > 0:
-                        target = self._resolve_relative_import(node.level, module_name, p)
-                    else:
-                        target = self._resolve_import(module_name, p)
-                        
-                    if target and target != p:
-                        imported_files.add(target)
-                        self._edges.append((p, target))
-                elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "__import__":
-                    if node.args and isinstance(node.args[0], ast.Constant) and isinstance(node.args[0].value, str):
-                        target = self._resolve_import(node.args[0].value, p)
-                        if target and target != p:
-                            imported_files.add(target)
-                            self._edges.append((p, target))
+        for i, specs in zip(to_parse, parsed):
+            all_specs[i] = specs
+            if stats[i] is not None:
+                fresh[rels[i]] = [*stats[i], specs]
+
+        if self.cache_dir is not None:
+            self.cache_stats["hits"] += len(paths) - len(to_parse)
+            self.cache_stats["misses"] += len(to_parse)
+            if to_parse or len(fresh) != len(cached):
+                self._save_cache(fresh)
+
+        for p, specs in zip(paths, all_specs):
+            for level, module_name in specs:
+                # Handle relative imports (level > 0)
+                if level > 0:
+                    target = self._resolve_relative_import(level, module_name, p)
+                else:
+                    target = self._resolve_import(module_name, p)
+                if target and target != p:
+                    imported_files.add(target)
+                    self._edges.append((p, target))
 
         # Ensure deterministic edge order
         self._edges = sorted(list(set(self._edges)))
         return imported_files
 
+    def _cache_path(self) -> Path:
+        return Path(self.cache_dir) / STATIC_CACHE_NAME
+
+    def _load_cache(self) -> dict:
+        """rel -> [mtime_ns, size, specs] from the last run, or {}."""
+        if self.cache_dir is None:
+            return {}
+        try:
+            with open(self._cache_path(), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != STATIC_CACHE_VERSION:
+                return {}
+            return data["files"]
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            return {}
+
+    def _save_cache(self, files: dict):
+        """Atomically replace the cache file."""
+        cache_path = self._cache_path()
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": STATIC_CACHE_VERSION, "files": files}, f,
+                          separators=(",", ":"))
+            os.replace(tmp, cache_path)
+        except OSError as e:
+            log.debug(f"  Static import cache not written: {e}")
+
     def _resolve_relative_import(self, level: int, module: str, importer: Path) -> Path | None:
         """Resolve a 'from ..module import X' style relative import."""
         # Find the base directory based on level
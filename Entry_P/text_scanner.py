@@ -6,6 +6,11 @@ Catches things like Godot .tscn/.gd references, Markdown mentions, etc.
 import re
 from pathlib import Path
 
+try:
+    import ahocorasick  # Optional (pyahocorasick): one pass per file for all path mentions
+except ImportError:
+    ahocorasick = None
+
 IGNORE_DIRS = {"__pycache__", ".git", "node_modules", ".venv", "venv", "reports", ".tox"}
 
 # Extensions to scan for references
@@ -20,6 +25,48 @@ SCANNABLE_EXTS = {
 # Extensions that represent code files we might find references TO
 CODE_EXTS = {".py", ".gd", ".js", ".ts", ".rs", ".go", ".java", ".cs", ".rb", ".lua"}
 
+# Dotted module-style names (e.g. "core.engine"), for Strategy 2
+MODULE_PATTERN = re.compile(r'\b([a-zA-Z_]\w*(?:\.[a-zA-Z_]\w*)+)\b')
+
+
+class _BasenameIndex:
+    """
+    Finds which known basenames occur (as substrings) in a text without one
+    scan per basename: every occurrence of a basename ends with an
+    occurrence of its extension, so the text is searched once per distinct
+    extension and, at each hit, only the basename lengths seen with that
+    extension are looked up. Basenames without an extension are tested
+    directly.
+    """
+
+    def __init__(self, basenames):
+        self.basenames = frozenset(basenames)
+        self.bare = []             # basenames with no "."
+        self.lengths_by_ext = {}   # ".py" -> {len("engine.py"), ...}
+        for base in self.basenames:
+            dot = base.rfind(".")
+            if dot < 0:
+                self.bare.append(base)
+            else:
+                self.lengths_by_ext.setdefault(base[dot:], set()).add(len(base))
+
+    def occurring(self, text: str) -> set:
+        """Return the indexed basenames that occur in `text`."""
+        basenames = self.basenames
+        find = text.find
+        hits = {base for base in self.bare if base in text}
+        for ext, lengths in self.lengths_by_ext.items():
+            i = find(ext)
+            while i >= 0:
+                end = i + len(ext)
+                for n in lengths:
+                    if n <= end:
+                        candidate = text[end - n:end]
+                        if candidate in basenames:
+                            hits.add(candidate)
+                i = find(ext, i + 1)
+        return hits
+
 
 class TextScanner:
     def __init__(self, repo_root: Path):
@@ -49,6 +96,20 @@ class TextScanner:
 
         references = {}
 
+        # Strategy 1 matcher: with pyahocorasick, one automaton over every
+        # known path finds all of a file's mentions in a single pass
+        automaton = None
+        by_basename = {}  # basename -> [known paths], the fallback's prefilter
+        if ahocorasick is not None and known_paths:
+            automaton = ahocorasick.Automaton()
+            for known in known_paths:
+                automaton.add_word(known, known)
+            automaton.make_automaton()
+        else:
+            for known in known_paths:
+                by_basename.setdefault(known.rsplit("/", 1)[-1], []).append(known)
+        basename_index = _BasenameIndex(by_basename) if automaton is None else None
+
         for f in all_files:
             if any(part in IGNORE_DIRS for part in f.parts):
                 continue
@@ -63,22 +124,39 @@ class TextScanner:
             scanner_rel = str(f.relative_to(self.repo_root))
 
             # Strategy 1: Direct path mentions
-            for known in known_paths:
-                if known in text and known != scanner_rel:
-                    references.setdefault(known, []).append({
+            if automaton is not None:
+                found = {known for _, known in automaton.iter(text)}
+            else:
+                # A path can only be mentioned where its basename is, so only
+                # paths whose basename occurs get a full substring test
+                found = {known for base in basename_index.occurring(text)
+                         for known in by_basename[base] if known == base or known in text}
+            for known in sorted(found):
+                if known != scanner_rel:
+                    refs = references.get(known)
+                    if refs is None:
+                        refs = references[known] = []
+                    refs.append({
                         "kind": "text_reference",
                         "referrer": scanner_rel,
                         "match_type": "path",
                     })
 
             # Strategy 2: Module-style references (e.g., "core.engine" -> "core/engine.py")
-            module_pattern = re.compile(r'\b([a-zA-Z_]\w*(?:\.[a-zA-Z_]\w*)+)\b')
-            for match in module_pattern.finditer(text):
+            # A module named several times in one file is recorded once
+            seen_modules = set()
+            for match in MODULE_PATTERN.finditer(text):
                 mod = match.group(1)
+                if mod in seen_modules:
+                    continue
+                seen_modules.add(mod)
                 # Convert dotted path to file path
                 as_path = mod.replace(".", "/") + ".py"
                 if as_path in known_paths and as_path != scanner_rel:
-                    references.setdefault(as_path, []).append({
+                    refs = references.get(as_path)
+                    if refs is None:
+                        refs = references[as_path] = []
+                    refs.append({
                         "kind": "text_reference",
                         "referrer": scanner_rel,
                         "match_type": "module_dot",
@@ -5,6 +5,10 @@ from pathlib import Path
 from datetime import datetime
 import uuid
 
+# _run_batch rewrites the ledger after this many ops, so a hard crash
+# mid-batch loses at most this many "done" statuses
+BATCH_FLUSH_EVERY = 50
+
 class UndoManager:
     def __init__(self, repo_root: Path):
         self.repo_root = repo_root
@@ -91,6 +95,72 @@ class UndoManager:
             self.update_status(op_id, f"failed: {e}")
             return False
 
+    def batch_move(self, pairs: list, session_id: str = None) -> list:
+        """Move many (src_rel, dst_rel) pairs logging them to the ledger in bulk."""
+        ops = [("move", src, dst, self.repo_root / dst) for src, dst in pairs]
+        return self._run_batch(ops, session_id)
+
+    def batch_trash(self, rel_paths: list, session_id: str = None) -> list:
+        """Move many files or directories to the trash logging them to the ledger in bulk."""
+        ops = []
+        for rel_path in rel_paths:
+            trash_id = str(uuid.uuid4())
+            ops.append(("delete", rel_path, f".uacf_undo/trash/{trash_id}", self.trash_dir / trash_id))
+        return self._run_batch(ops, session_id)
+
+    def _run_batch(self, ops: list, session_id: str = None) -> list:
+        """
+        Log every op as pending, perform them, then record final statuses
+        (flushed every BATCH_FLUSH_EVERY ops and on any exit, even Ctrl-C).
+        ops: [(op_type, src_rel, dst_rel, dst_path), ...]
+        Returns one success flag per op, in order.
+        """
+        ledger = self._load_ledger()
+        now = datetime.now().isoformat()
+        entries = []
+        for op_type, src_rel, dst_rel, _ in ops:
+            entry = {
+                "id": str(uuid.uuid4()),
+                "timestamp": now,
+                "session_id": session_id or "default",
+                "op_type": op_type,
+                "src": src_rel,
+                "dst": dst_rel,
+                "status": "pending"
+            }
+            ledger.append(entry)
+            entries.append(entry)
+        self._save_ledger(ledger)
+
+        results = []
+        try:
+            for i, ((op_type, src_rel, _, dst_path), entry) in enumerate(zip(ops, entries)):
+                src_path = self.repo_root / src_rel
+                if op_type == "delete" and not src_path.exists():
+                    # Matches move_to_trash: nothing to do, not logged as an operation
+                    ledger.remove(entry)
+                    results.append(False)
+                    continue
+                try:
+                    if op_type == "move":
+                        dst_path.parent.mkdir(parents=True, exist_ok=True)
+                    shutil.move(str(src_path), str(dst_path))
+                    entry["status"] = "done"
+                    results.append(True)
+                except Exception as e:
+                    entry["status"] = f"failed: {e}"
+                    results.append(False)
+                if (i + 1) % BATCH_FLUSH_EVERY == 0:
+                    self._save_ledger(ledger)
+        finally:
+            # Also runs on KeyboardInterrupt: record what completed, and drop
+            # ops that never started (the interrupted one stays pending)
+            unstarted = {entry["id"] for entry in entries[len(results) + 1:]}
+            if unstarted:
+                ledger = [e for e in ledger if e["id"] not in unstarted]
+            self._save_ledger(ledger)
+        return results
+
     def undo_session(self, session_id: str = None) -> dict:
         """Undo the most recent session or a specific session."""
         ledger = self._load_ledger()